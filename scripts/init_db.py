@@ -1,7 +1,15 @@
-import os
-from pymongo import MongoClient
-from pymongo.errors import OperationFailure
 import logging
+import sys
+from pathlib import Path
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+# Allow `python scripts/init_db.py` from the repo root (README bootstrap
+# path): the script dir is on sys.path, the repo root is not
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.db import get_db
 
 # Configure logging
 logging.basicConfig(
@@ -10,63 +18,90 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def setup_indexes(mongodb_uri):
+# Named IndexModels grouped per collection; one create_indexes call per
+# collection builds them in a single command, and the explicit names make
+# re-runs idempotent (pymongo short-circuits identical existing indexes)
+PRODUCT_INDEXES = [
+    IndexModel([("sku", ASCENDING)], name="sku_unique", unique=True),
+    IndexModel([("name", ASCENDING)], name="name"),
+    IndexModel([("category", ASCENDING)], name="category"),
+    IndexModel(
+        [("name", "text"), ("description", "text"), ("sku", "text")],
+        name="product_search_text"
+    ),
+]
+
+INVENTORY_INDEXES = [
+    IndexModel(
+        [("productId", ASCENDING), ("storeId", ASCENDING)],
+        name="productId_storeId_unique",
+        unique=True
+    ),
+    IndexModel([("storeId", ASCENDING)], name="storeId"),
+    IndexModel([("quantity", ASCENDING)], name="quantity"),
+    IndexModel(
+        [("quantity", ASCENDING), ("minStock", ASCENDING)],
+        name="quantity_minStock"
+    ),
+    # Covers get_low_stock_products (filter + projected fields)
+    IndexModel(
+        [("quantity", ASCENDING), ("productId", ASCENDING)],
+        name="quantity_productId_covered"
+    ),
+    # Stock alerts match the denormalized lowStock flag maintained on
+    # every inventory write; the partial index holds only alerting rows
+    IndexModel(
+        [("lowStock", ASCENDING), ("storeId", ASCENDING)],
+        name="low_stock_partial",
+        partialFilterExpression={"lowStock": True}
+    ),
+]
+
+MOVEMENT_INDEXES = [
+    IndexModel([("productId", ASCENDING)], name="productId"),
+    IndexModel([("timestamp", DESCENDING)], name="timestamp_desc"),
+    IndexModel(
+        [("sourceStoreId", ASCENDING), ("timestamp", DESCENDING)],
+        name="sourceStoreId_timestamp"
+    ),
+    IndexModel(
+        [("targetStoreId", ASCENDING), ("timestamp", DESCENDING)],
+        name="targetStoreId_timestamp"
+    ),
+    IndexModel(
+        [("type", ASCENDING), ("timestamp", DESCENDING)],
+        name="type_timestamp"
+    ),
+]
+
+def setup_indexes():
     """Create MongoDB indexes for optimizing frequent operations."""
-    client = MongoClient(mongodb_uri)
-    db = client.inventory_db
-    
+    # Same database the services and the Lambda read (get_db defaults to
+    # inventory_management); indexing anywhere else leaves search_products'
+    # $text query and get_low_stock_products' hint with nothing to use
+    db = get_db()
+
     try:
-        # Product indexes
         logger.info("Creating product indexes...")
-        db.products.create_index([("sku", 1)], unique=True)
-        db.products.create_index([("name", 1)])
-        db.products.create_index([("category", 1)])
-        
-        # Inventory indexes
+        db.products.create_indexes(PRODUCT_INDEXES)
+
         logger.info("Creating inventory indexes...")
-        db.inventory.create_index([
-            ("productId", 1),
-            ("storeId", 1)
-        ], unique=True)
-        db.inventory.create_index([("storeId", 1)])
-        db.inventory.create_index([("quantity", 1)])
-        db.inventory.create_index([
-            ("quantity", 1),
-            ("minStock", 1)
-        ])
-        
-        # Movement indexes
+        db.inventory.create_indexes(INVENTORY_INDEXES)
+
         logger.info("Creating movement indexes...")
-        db.movement.create_index([("productId", 1)])
-        db.movement.create_index([("timestamp", -1)])
-        db.movement.create_index([
-            ("sourceStoreId", 1),
-            ("timestamp", -1)
-        ])
-        db.movement.create_index([
-            ("targetStoreId", 1),
-            ("timestamp", -1)
-        ])
-        db.movement.create_index([
-            ("type", 1),
-            ("timestamp", -1)
-        ])
-        
+        db.movements.create_indexes(MOVEMENT_INDEXES)
+
         logger.info("Successfully created all indexes")
-        
+
     except OperationFailure as e:
         logger.error(f"Error creating indexes: {str(e)}")
         raise
-    finally:
-        client.close()
 
 def main():
     """Main function to set up MongoDB indexes."""
-    mongodb_uri = os.getenv('MONGODB_URI', 'mongodb://127.0.0.1:27017/?replicaSet=rs0&directConnection=true')
-    
     try:
-        logger.info(f"Connecting to MongoDB at {mongodb_uri}")
-        setup_indexes(mongodb_uri)
+        logger.info("Connecting to MongoDB")
+        setup_indexes()
         logger.info("Database initialization completed successfully")
     except Exception as e:
         logger.error(f"Database initialization failed: {str(e)}")
@@ -0,0 +1,26 @@
+# services/db.py
+import os
+from functools import lru_cache
+
+from pymongo import MongoClient
+
+DEFAULT_MONGO_URI = "mongodb://127.0.0.1:27017/?replicaSet=rs0&directConnection=true"
+
+
+@lru_cache(maxsize=1)
+def get_client():
+    """Return a shared MongoClient with explicit connection-pool sizing"""
+    mongo_uri = os.getenv("MONGO_DB_URI") or os.getenv("MONGODB_URI", DEFAULT_MONGO_URI)
+    return MongoClient(
+        mongo_uri,
+        maxPoolSize=200,
+        minPoolSize=10,
+        maxIdleTimeMS=300_000,
+        retryWrites=True,
+        w="majority"
+    )
+
+
+def get_db(name="inventory_management"):
+    """Return a database handle from the shared client"""
+    return get_client()[name]
@@ -1,19 +1,37 @@
 # services/inventory_service.py
+import time
+
 from bson import ObjectId
+from pymongo import ReturnDocument
 
 class InventoryService:
     def __init__(self, db):
         self.db = db
+        # Memoizes product-existence lookups for the life of this instance
+        # (one request), so repeated checks on the same id hit the DB once
+        self._exists_cache = {}
+
+    def _product_exists(self, object_id):
+        """Check product existence, memoized per service instance"""
+        hex_id = str(object_id)
+        if hex_id not in self._exists_cache:
+            self._exists_cache[hex_id] = bool(
+                self.db.products.find_one({"_id": object_id}, {"_id": 1})
+            )
+        return self._exists_cache[hex_id]
 
     def get_product_stock(self, product_id):
         """Get current stock for a product"""
         try:
+            # Parse once and reuse the ObjectId
+            pid = ObjectId(product_id)
+
             # Validate product exists
-            if not self.db.products.find_one({"_id": ObjectId(product_id)}):
+            if not self._product_exists(pid):
                 raise ValueError("Product not found")
 
             # Get inventory
-            inventory = self.db.inventory.find_one({"productId": ObjectId(product_id)})
+            inventory = self.db.inventory.find_one({"productId": pid})
             return {
                 "productId": str(product_id),
                 "quantity": inventory["quantity"] if inventory else 0
@@ -23,50 +41,148 @@ class InventoryService:
         except Exception as e:
             raise ValueError(f"Error retrieving stock: {str(e)}")
 
-    def get_all_stock(self):
-        """Get current stock for all products"""
+    def get_all_stock(self, skip=0, limit=500):
+        """Get current stock for all products (paginated, capped at 5000)"""
         try:
-            inventory = list(self.db.inventory.find())
+            cursor = (
+                self.db.inventory
+                .find({}, {"productId": 1, "quantity": 1, "_id": 0})
+                .skip(skip)
+                .limit(min(limit, 5000))
+                .batch_size(500)
+            )
             return [{
                 "productId": str(item["productId"]),
                 "quantity": item["quantity"]
-            } for item in inventory]
+            } for item in cursor]
+        except Exception as e:
+            raise ValueError(f"Error retrieving inventory: {str(e)}")
+
+    def get_all_stock_with_product(self):
+        """Get current stock for all products joined with product name/sku"""
+        try:
+            pipeline = [
+                {
+                    "$lookup": {
+                        "from": "products",
+                        "localField": "productId",
+                        "foreignField": "_id",
+                        "as": "product"
+                    }
+                },
+                {"$unwind": "$product"},
+                {
+                    "$project": {
+                        "productId": 1,
+                        "quantity": 1,
+                        "name": "$product.name",
+                        "sku": "$product.sku",
+                        "_id": 0
+                    }
+                }
+            ]
+            inventory = list(self.db.inventory.aggregate(pipeline))
+            for item in inventory:
+                item["productId"] = str(item["productId"])
+            return inventory
         except Exception as e:
             raise ValueError(f"Error retrieving inventory: {str(e)}")
 
-    def get_low_stock_products(self, threshold=10):
-        """Get products with stock below threshold"""
+    def get_low_stock_products(self, threshold=10, skip=0, limit=500):
+        """Get products with stock below threshold (paginated, capped at 5000)"""
         try:
-            low_stock = list(self.db.inventory.find({"quantity": {"$lte": threshold}}))
+            # Covered query: filter, projection and hint all live in the
+            # (quantity, productId) index, so the server never fetches docs
+            cursor = (
+                self.db.inventory
+                .find(
+                    {"quantity": {"$lte": threshold}},
+                    {"_id": 0, "productId": 1, "quantity": 1}
+                )
+                .hint([("quantity", 1), ("productId", 1)])
+                .skip(skip)
+                .limit(min(limit, 5000))
+                .batch_size(500)
+            )
             return [{
                 "productId": str(item["productId"]),
                 "quantity": item["quantity"]
-            } for item in low_stock]
+            } for item in cursor]
         except Exception as e:
             raise ValueError(f"Error retrieving low stock products: {str(e)}")
 
-    def adjust_stock(self, product_id, quantity):
-        """Manually adjust stock quantity"""
+    def adjust_stock(self, product_id, quantity, max_retries=3):
+        """
+        Manually adjust stock quantity
+
+        Absolute $set updates use an optimistic version check so concurrent
+        adjustments cannot silently overwrite each other; on a version
+        mismatch the update is retried with exponential backoff.
+        """
         try:
+            # Parse once and reuse the ObjectId
+            pid = ObjectId(product_id)
+
             # Validate product exists
-            if not self.db.products.find_one({"_id": ObjectId(product_id)}):
+            if not self._product_exists(pid):
                 raise ValueError("Product not found")
 
             # Validate quantity
             if not isinstance(quantity, (int, float)) or quantity < 0:
                 raise ValueError("Quantity must be a positive number")
 
-            # Update inventory
-            result = self.db.inventory.update_one(
-                {"productId": ObjectId(product_id)},
-                {
-                    "$set": {"quantity": quantity},
-                    "$setOnInsert": {"productId": ObjectId(product_id)}
-                },
-                upsert=True
-            )
+            for attempt in range(max_retries):
+                current = self.db.inventory.find_one(
+                    {"productId": pid},
+                    {"version": 1}
+                )
+                if current is None:
+                    # First write for this product
+                    filter_query = {"productId": pid}
+                    update = {"$set": {"quantity": quantity, "version": 1}}
+                    upsert = True
+                elif "version" not in current:
+                    # Docs created before versioning (or by plain upserts)
+                    # carry no version field; matching its absence is the
+                    # only filter that can claim them, and the write stamps
+                    # version 1 so later attempts take the normal path
+                    filter_query = {
+                        "productId": pid,
+                        "version": {"$exists": False}
+                    }
+                    update = {"$set": {"quantity": quantity, "version": 1}}
+                    upsert = False
+                else:
+                    filter_query = {
+                        "productId": pid,
+                        "version": current["version"]
+                    }
+                    update = {
+                        "$set": {"quantity": quantity},
+                        "$inc": {"version": 1}
+                    }
+                    upsert = False
 
-            return {"message": "Stock adjusted successfully"}
+                # Returning the post-update doc saves callers the usual
+                # confirmation read after an adjustment
+                updated = self.db.inventory.find_one_and_update(
+                    filter_query,
+                    update,
+                    upsert=upsert,
+                    return_document=ReturnDocument.AFTER,
+                    projection={"_id": 0, "productId": 1, "quantity": 1}
+                )
+                if updated:
+                    return {
+                        "message": "Stock adjusted successfully",
+                        "productId": str(updated["productId"]),
+                        "quantity": updated["quantity"]
+                    }
+
+                # Lost the race; back off and retry against the new version
+                time.sleep(0.05 * (2 ** attempt))
+
+            raise ValueError("Stock adjustment conflicted with concurrent updates")
         except ValueError as e:
             raise e
         except Exception as e:
@@ -78,25 +194,28 @@ class InventoryService:
         adjustments: list of tuples (product_id, quantity)
         """
         try:
-            # Validate all products and quantities first
-            for product_id, quantity in adjustments:
-                if not self.db.products.find_one({"_id": ObjectId(product_id)}):
+            # Validate all products with a single batched query, then quantities
+            ids = [ObjectId(product_id) for product_id, _ in adjustments]
+            found = {
+                doc["_id"]
+                for doc in self.db.products.find({"_id": {"$in": ids}}, {"_id": 1})
+            }
+            for (product_id, quantity), object_id in zip(adjustments, ids):
+                if object_id not in found:
                     raise ValueError(f"Product {product_id} not found")
                 if not isinstance(quantity, (int, float)) or quantity < 0:
                     raise ValueError(f"Invalid quantity for product {product_id}")
 
+            # Reuse the ObjectIds parsed during validation
             operations = [
                 {
                     "updateOne": {
-                        "filter": {"productId": ObjectId(pid)},
-                        "update": {
-                            "$set": {"quantity": qty},
-                            "$setOnInsert": {"productId": ObjectId(pid)}
-                        },
+                        "filter": {"productId": object_id},
+                        "update": {"$set": {"quantity": qty}},
                         "upsert": True
                     }
                 }
-                for pid, qty in adjustments
+                for (_, qty), object_id in zip(adjustments, ids)
             ]
             
             result = self.db.inventory.bulk_write(operations)
@@ -1,6 +1,20 @@
 # services/movement_service.py
 from datetime import datetime
 from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.write_concern import WriteConcern
+
+# Aggregation stages that rename _id -> id and stringify ObjectIds
+# server-side, so list endpoints need no per-row Python formatting
+_FORMAT_STAGES = [
+    {
+        "$addFields": {
+            "id": {"$toString": "$_id"},
+            "productId": {"$toString": "$productId"}
+        }
+    },
+    {"$unset": "_id"}
+]
 
 class MovementService:
     def __init__(self, db):
@@ -20,7 +34,7 @@ class MovementService:
             # Validate product exists
             try:
                 product_id = ObjectId(movement_data["productId"])
-                if not self.db.products.find_one({"_id": product_id}):
+                if not self.db.products.find_one({"_id": product_id}, {"_id": 1}):
                     raise ValueError("Product not found")
             except ValueError as e:
                 raise e  # Re-raise ValueError for "Product not found"
@@ -35,30 +49,31 @@ class MovementService:
             if movement_data["quantity"] <= 0:
                 raise ValueError("Quantity must be positive")
 
-            # Check stock for OUT movements
+            # Convert productId to ObjectId
+            movement_data["productId"] = product_id
+
+            # Update inventory; OUT decrements atomically only when enough
+            # stock exists, collapsing the read-then-write into one round trip
             if movement_data["type"] == "OUT":
-                current_stock = self.db.inventory.find_one({"productId": product_id})
-                current_quantity = current_stock["quantity"] if current_stock else 0
-                if current_quantity < movement_data["quantity"]:
+                updated = self.db.inventory.find_one_and_update(
+                    {
+                        "productId": product_id,
+                        "quantity": {"$gte": movement_data["quantity"]}
+                    },
+                    {"$inc": {"quantity": -movement_data["quantity"]}}
+                )
+                if not updated:
                     raise ValueError("Insufficient stock")
+            else:
+                self.db.inventory.update_one(
+                    {"productId": product_id},
+                    {"$inc": {"quantity": movement_data["quantity"]}},
+                    upsert=True
+                )
 
-            # Convert productId to ObjectId
-            movement_data["productId"] = product_id
-            
             # Insert movement
             result = self.db.movements.insert_one(movement_data)
 
-            # Update inventory
-            update_quantity = movement_data["quantity"] if movement_data["type"] == "IN" else -movement_data["quantity"]
-            self.db.inventory.update_one(
-                {"productId": movement_data["productId"]},
-                {
-                    "$inc": {"quantity": update_quantity},
-                    "$setOnInsert": {"productId": movement_data["productId"]}
-                },
-                upsert=True
-            )
-
             return {
                 "message": "Movement created successfully",
                 "id": str(result.inserted_id)
@@ -69,6 +84,83 @@ class MovementService:
         except Exception as e:
             raise ValueError(f"Error creating movement: {str(e)}")
 
+    def create_movements(self, movements, durability="hard"):
+        """
+        Create a batch of inventory movements with bulk writes
+        movements: list of movement dicts (productId, type, quantity, ...)
+        durability: "hard" (default) acknowledges each insert batch;
+            "soft" issues the movement inserts with w=0, trading the
+            acknowledgement round trip for throughput on bursty
+            ingestion where losing an audit row on crash is acceptable.
+            Inventory updates are always acknowledged.
+        """
+        try:
+            if not movements:
+                raise ValueError("No movements provided")
+
+            # Validate all movements Python-side first
+            for movement_data in movements:
+                if "productId" not in movement_data:
+                    raise ValueError("productId is required")
+                if "type" not in movement_data:
+                    raise ValueError("type is required")
+                if "quantity" not in movement_data:
+                    raise ValueError("quantity is required")
+                if movement_data["type"] not in ["IN", "OUT"]:
+                    raise ValueError("Invalid movement type. Must be 'IN' or 'OUT'")
+                if movement_data["quantity"] <= 0:
+                    raise ValueError("Quantity must be positive")
+
+            try:
+                ids = [ObjectId(m["productId"]) for m in movements]
+            except ValueError as e:
+                raise e
+            except Exception:
+                raise ValueError("Invalid product ID format")
+
+            # Validate all referenced products with a single batched query
+            found = {
+                doc["_id"]
+                for doc in self.db.products.find({"_id": {"$in": ids}}, {"_id": 1})
+            }
+            for movement_data, object_id in zip(movements, ids):
+                if object_id not in found:
+                    raise ValueError(f"Product {movement_data['productId']} not found")
+                movement_data["productId"] = object_id
+
+            # One insert_many for the movements, one bulk_write for inventory;
+            # ordered=False lets the server apply non-conflicting ops in parallel
+            operations = [
+                UpdateOne(
+                    {"productId": m["productId"]},
+                    {
+                        "$inc": {
+                            "quantity": m["quantity"] if m["type"] == "IN" else -m["quantity"]
+                        }
+                    },
+                    upsert=True
+                )
+                for m in movements
+            ]
+            movements_collection = self.db.movements
+            if durability == "soft":
+                movements_collection = movements_collection.with_options(
+                    write_concern=WriteConcern(w=0)
+                )
+            insert_result = movements_collection.insert_many(movements, ordered=False)
+            update_result = self.db.inventory.bulk_write(operations, ordered=False)
+
+            return {
+                "message": "Movements created successfully",
+                "inserted_count": len(insert_result.inserted_ids),
+                "modified_count": update_result.modified_count
+            }
+
+        except ValueError as e:
+            raise e
+        except Exception as e:
+            raise ValueError(f"Error creating movements: {str(e)}")
+
     def get_movement_by_id(self, movement_id):
         """Get a movement by ID"""
         try:
@@ -94,8 +186,10 @@ class MovementService:
             except Exception:
                 raise ValueError("Invalid product ID format")
 
-            movements = list(self.db.movements.find({"productId": object_id}))
-            return [self._format_movement(movement) for movement in movements]
+            return list(self.db.movements.aggregate(
+                [{"$match": {"productId": object_id}}] + _FORMAT_STAGES,
+                batchSize=1000
+            ))
         except ValueError as e:
             raise e
         except Exception as e:
@@ -104,13 +198,18 @@ class MovementService:
     def get_movements_by_date_range(self, start_date, end_date):
         """Get movements within a date range"""
         try:
-            movements = list(self.db.movements.find({
-                "date": {
-                    "$gte": start_date,
-                    "$lte": end_date
+            match = {
+                "$match": {
+                    "date": {
+                        "$gte": start_date,
+                        "$lte": end_date
+                    }
                 }
-            }))
-            return [self._format_movement(movement) for movement in movements]
+            }
+            return list(self.db.movements.aggregate(
+                [match] + _FORMAT_STAGES,
+                batchSize=1000
+            ))
         except Exception as e:
             raise ValueError(f"Error retrieving movements: {str(e)}")
 
@@ -119,9 +218,11 @@ class MovementService:
         try:
             if movement_type not in ["IN", "OUT"]:
                 raise ValueError("Invalid movement type. Must be 'IN' or 'OUT'")
-            
-            movements = list(self.db.movements.find({"type": movement_type}))
-            return [self._format_movement(movement) for movement in movements]
+
+            return list(self.db.movements.aggregate(
+                [{"$match": {"type": movement_type}}] + _FORMAT_STAGES,
+                batchSize=1000
+            ))
         except ValueError as e:
             raise e
         except Exception as e:
@@ -1,4 +1,6 @@
 # services/product_service.py
+import re
+
 from bson import ObjectId
 
 class ProductService:
@@ -14,7 +16,7 @@ class ProductService:
                 raise ValueError(f"Missing required field: {field}")
 
         # Validate SKU uniqueness
-        if self.db.products.find_one({"sku": product_data["sku"]}):
+        if self.db.products.find_one({"sku": product_data["sku"]}, {"_id": 1}):
             raise ValueError("SKU already exists")
 
         # Insert the product
@@ -24,6 +26,36 @@ class ProductService:
             "id": str(result.inserted_id)
         }
 
+    def create_products(self, batch):
+        """Create a batch of products with a single insert_many"""
+        if not batch:
+            raise ValueError("No products provided")
+
+        # Validate required fields
+        required_fields = ['name', 'description', 'category', 'price', 'sku']
+        for product_data in batch:
+            for field in required_fields:
+                if field not in product_data:
+                    raise ValueError(f"Missing required field: {field}")
+
+        # Validate SKU uniqueness within the batch and against the DB
+        skus = [product_data["sku"] for product_data in batch]
+        if len(set(skus)) != len(skus):
+            raise ValueError("Duplicate SKU in batch")
+        existing = {
+            doc["sku"]
+            for doc in self.db.products.find({"sku": {"$in": skus}}, {"sku": 1})
+        }
+        if existing:
+            raise ValueError(f"SKU already exists: {', '.join(sorted(existing))}")
+
+        # ordered=False lets the remaining inserts proceed if one fails
+        result = self.db.products.insert_many(batch, ordered=False)
+        return {
+            "message": "Products created successfully",
+            "ids": [str(inserted_id) for inserted_id in result.inserted_ids]
+        }
+
     def get_product_by_id(self, product_id):
         """Get a product by ID"""
         try:
@@ -41,7 +73,7 @@ class ProductService:
         """Update a product"""
         try:
             # Check if product exists
-            if not self.db.products.find_one({"_id": ObjectId(product_id)}):
+            if not self.db.products.find_one({"_id": ObjectId(product_id)}, {"_id": 1}):
                 raise ValueError("Product not found")
 
             # If SKU is being updated, check for uniqueness
@@ -49,7 +81,7 @@ class ProductService:
                 existing = self.db.products.find_one({
                     "sku": update_data["sku"],
                     "_id": {"$ne": ObjectId(product_id)}
-                })
+                }, {"_id": 1})
                 if existing:
                     raise ValueError("SKU already exists")
 
@@ -72,11 +104,11 @@ class ProductService:
         """Delete a product"""
         try:
             # Check if product exists
-            if not self.db.products.find_one({"_id": ObjectId(product_id)}):
+            if not self.db.products.find_one({"_id": ObjectId(product_id)}, {"_id": 1}):
                 raise ValueError("Product not found")
 
             # Check if product is referenced in inventory
-            if self.db.inventory.find_one({"productId": ObjectId(product_id)}):
+            if self.db.inventory.find_one({"productId": ObjectId(product_id)}, {"_id": 1}):
                 raise ValueError("Cannot delete product that exists in inventory")
 
             # Delete the product
@@ -93,21 +125,27 @@ class ProductService:
 
     def get_all_products(self, skip=0, limit=50):
         """Get all products with pagination"""
-        products = list(self.db.products.find().skip(skip).limit(limit))
-        for product in products:
+        # Stream the cursor in batches rather than materializing it up front
+        cursor = self.db.products.find().skip(skip).limit(limit).batch_size(500)
+        products = []
+        for product in cursor:
             product["id"] = str(product.pop("_id"))
+            products.append(product)
         return products
 
     def search_products(self, query):
-        """Search products by name, description, or SKU"""
+        """Search products by SKU prefix or name/description text match"""
+        # The anchored SKU regex is served by the sku btree as a range scan;
+        # the text clause covers name/description via the text index
         filter_query = {
             "$or": [
-                {"name": {"$regex": query, "$options": "i"}},
-                {"description": {"$regex": query, "$options": "i"}},
-                {"sku": {"$regex": query, "$options": "i"}}
+                {"sku": {"$regex": f"^{re.escape(query)}"}},
+                {"$text": {"$search": query}}
             ]
         }
-        products = list(self.db.products.find(filter_query))
-        for product in products:
+        cursor = self.db.products.find(filter_query).batch_size(500)
+        products = []
+        for product in cursor:
             product["id"] = str(product.pop("_id"))
+            products.append(product)
         return products
@@ -14,30 +14,66 @@ Key Features:
     - MongoDB integration for data persistence
 """
 
-import json
+import hashlib
 import os
-from datetime import datetime
-from bson import ObjectId
-from common.db_utils import get_mongo_client
-from enum import Enum
+import re
+import time
+
+import orjson
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.utilities.typing import LambdaContext
 from decorators.logging_decorator import log_request
 
-# Initialize logger and MongoDB connection
+# Initialize logger
 logger = Logger(service="inventory-management")
-try:
-    mongo_client = get_mongo_client()
-    db = mongo_client["inventory_management"]
-    logger.info("MongoDB connection initialized at module level")
-except Exception as e:
-    logger.error("Failed to initialize MongoDB connection at module level", extra={"error": str(e)})
-    raise
-
-class MovementType(Enum):
+
+# Shared database handle; created lazily on first use and reused across
+# warm Lambda invocations so the TLS handshake and DNS lookup happen once
+_DB = None
+
+def _ensure_indexes(db):
+    """Creates the hot-path indexes. Idempotent; existing indexes are a no-op.
+
+    Names must match scripts/init_db.py: the same key spec under a
+    different name raises IndexOptionsConflict, and a failure here must
+    not take down the data path, so index errors are logged and swallowed.
+    """
+    from pymongo.errors import OperationFailure
+    try:
+        db.inventory.create_index(
+            [("productId", 1), ("storeId", 1)],
+            name="productId_storeId_unique", unique=True, background=True
+        )
+        db.inventory.create_index([("storeId", 1)], name="storeId", background=True)
+        db.products.create_index([("sku", 1)], name="sku_unique", unique=True, background=True)
+        db.movements.create_index(
+            [("productId", 1), ("timestamp", -1)],
+            name="productId_timestamp", background=True
+        )
+    except OperationFailure as e:
+        logger.warning("Index bootstrap failed; continuing without it", extra={"error": str(e)})
+
+def _get_db():
+    """Returns the shared database handle, creating the client on first use."""
+    global _DB
+    if _DB is None:
+        from common.db_utils import get_mongo_client
+        _DB = get_mongo_client(lazy=True)["inventory_management"]
+        # Opt-in so production containers do not pay four createIndexes
+        # round trips per cold start once the indexes exist
+        if os.environ.get('CREATE_INDEXES') == '1':
+            _ensure_indexes(_DB)
+        logger.info("MongoDB client initialized for this container")
+    return _DB
+
+class MovementType:
     """
-    Enumeration of possible inventory movement types.
-    
+    Possible inventory movement types.
+
+    Plain string constants instead of an Enum: handlers only ever need the
+    raw value, and skipping the enum import and metaclass keeps it off the
+    cold-start path.
+
     Values:
         IN: Initial stock or restocking
         OUT: Stock removal or sales
@@ -47,86 +83,173 @@ class MovementType(Enum):
     OUT = "OUT"
     TRANSFER = "TRANSFER"
 
+# Shared response headers; never mutated, so one dict serves every response
+_HEADERS = {
+    "Content-Type": "application/json",
+    "Access-Control-Allow-Origin": "*"
+}
+
 def create_response(status_code, body):
     """Creates a standardized API response."""
     return {
         "statusCode": status_code,
-        "headers": {
-            "Content-Type": "application/json",
-            "Access-Control-Allow-Origin": "*"
-        },
-        "body": json.dumps(body, default=str)
+        "headers": _HEADERS,
+        "body": orjson.dumps(body, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
     }
 
-def validate_fields(data, required_fields):
-    """Validates that all required fields are present in the data."""
-    missing_fields = [field for field in required_fields if field not in data]
-    if missing_fields:
-        logger.warning("Missing required fields", extra={"missing_fields": missing_fields})
-        raise ValueError(f"Missing required fields: {', '.join(missing_fields)}")
+def create_json_response(status_code, body_json, extra_headers=None):
+    """Creates a standardized API response from an already-serialized body."""
+    return {
+        "statusCode": status_code,
+        "headers": {**_HEADERS, **extra_headers} if extra_headers else _HEADERS,
+        "body": body_json
+    }
+
+# Warm-container cache for the product list: the catalog changes rarely
+# compared to how often it is listed, so a short TTL absorbs most reads
+# without a database round trip. Per-container only - each Lambda container
+# has its own copy and a stale one self-heals within the TTL.
+_PRODUCT_CACHE = {"body": None, "etag": None, "ts": 0.0}
+_PRODUCT_CACHE_TTL = 30  # seconds
+
+def _invalidate_product_cache():
+    """Drops the cached product list after any product write."""
+    _PRODUCT_CACHE["body"] = None
+    _PRODUCT_CACHE["ts"] = 0.0
+
+def _stream_json_array(cursor, transform=None):
+    """
+    Serializes a cursor straight into a JSON array string.
+
+    Iterating the cursor once and appending each orjson-serialized document
+    to a single growing bytearray avoids holding the full result list and
+    its JSON string in memory at the same time, which halves transient
+    memory for large list responses.
+    """
+    buf = bytearray(b'[')
+    first = True
+    for doc in cursor:
+        if not first:
+            buf += b','
+        buf += orjson.dumps(transform(doc) if transform else doc, default=str)
+        first = False
+    buf += b']'
+    return buf.decode()
+
+# Required-field sets for the write endpoints, built once at import
+_PRODUCT_REQUIRED = frozenset({'name', 'sku', 'price'})
+_INVENTORY_REQUIRED = frozenset({'productId', 'storeId', 'quantity', 'minStock'})
+_TRANSFER_REQUIRED = frozenset({'productId', 'sourceStoreId', 'targetStoreId', 'quantity'})
+
+def _parse_body(event, required=frozenset()):
+    """Parses the request body and validates required fields in one step."""
+    body = event.get('body')
+    data = orjson.loads(body) if isinstance(body, (str, bytes)) else (body or {})
+    missing = required - data.keys()
+    if missing:
+        logger.warning("Missing required fields", extra={"missing_fields": sorted(missing)})
+        raise ValueError(f"Missing required fields: {', '.join(sorted(missing))}")
+    return data
+
+# 24-hex guard for ObjectId strings: a regex match rejects malformed ids
+# without the raise/catch round trip of calling the constructor blind
+_OID_RE = re.compile(r"^[0-9a-fA-F]{24}$").match
+
+def _parse_oid(value):
+    """Returns the parsed ObjectId, or None when value is not a valid id."""
+    if not (isinstance(value, str) and _OID_RE(value)):
+        return None
+    from bson import ObjectId
+    return ObjectId(value)
+
+def _require_oid(event, field='id'):
+    """
+    Extracts and parses an ObjectId path parameter.
+
+    Returns (oid, None) on success, or (None, response) when the value is
+    missing or malformed, so handlers bail out with a single branch.
+    """
+    value = (event.get('pathParameters') or {}).get(field)
+    if not value:
+        logger.warning("Missing product ID")
+        return None, create_response(400, {"message": "Product ID is required"})
+    oid = _parse_oid(value)
+    if oid is None:
+        logger.warning("Invalid product ID format", extra={"product_id": value})
+        return None, create_response(400, {"message": "Invalid product ID format"})
+    return oid, None
 
 @log_request
 def lambda_handler(event: dict, context: LambdaContext) -> dict:
     """Main Lambda handler that routes requests to appropriate functions."""
     try:
-        function_name = os.getenv('FUNCTION_NAME')
         logger.info("Processing request", extra={
-            "function": function_name,
+            "function": _FUNCTION_NAME,
             "request_id": context.aws_request_id
         })
-        
-        handler_function = function_map.get(function_name)
-        if not handler_function:
-            logger.error("Invalid function name", extra={"function_name": function_name})
+
+        if _HANDLER is None:
+            logger.error("Invalid function name", extra={"function_name": _FUNCTION_NAME})
             return create_response(400, {"message": "Invalid function name"})
-        
-        return handler_function(event, context)
+
+        return _HANDLER(event, context)
         
     except Exception as e:
         logger.exception("Unexpected error", extra={"error": str(e)})
         return create_response(500, {"message": "Internal server error"})
 
 # Product Management Functions
-@log_request
 def list_products(event: dict, context: LambdaContext) -> dict:
     """Lists all products in the system."""
     try:
         logger.info("Retrieving all products")
-        products = list(db.products.find({}, {
-            '_id': 1, 
-            'name': 1, 
-            'description': 1, 
-            'category': 1, 
-            'price': 1, 
-            'sku': 1
-        }))
-        
-        for product in products:
-            product["id"] = str(product.pop("_id"))
-            
-        logger.info("Products retrieved successfully", extra={"count": len(products)})
-        return create_response(200, products)
+
+        now = time.monotonic()
+        if _PRODUCT_CACHE["body"] is not None and now - _PRODUCT_CACHE["ts"] < _PRODUCT_CACHE_TTL:
+            body = _PRODUCT_CACHE["body"]
+            etag = _PRODUCT_CACHE["etag"]
+        else:
+            db = _get_db()
+            # The _id -> id rename happens server-side, so no per-document
+            # Python loop and json.dumps never hits the default=str fallback
+            body = _stream_json_array(db.products.aggregate([
+                {
+                    "$project": {
+                        "id": {"$toString": "$_id"},
+                        "name": 1,
+                        "description": 1,
+                        "category": 1,
+                        "price": 1,
+                        "sku": 1,
+                        "_id": 0
+                    }
+                }
+            ], batchSize=500))
+            etag = hashlib.blake2b(body.encode(), digest_size=8).hexdigest()
+            _PRODUCT_CACHE.update(body=body, etag=etag, ts=now)
+
+        cache_headers = {"ETag": etag, "Cache-Control": "public, max-age=30"}
+        if (event.get('headers') or {}).get('If-None-Match') == etag:
+            return create_json_response(304, '', cache_headers)
+
+        return create_json_response(200, body, cache_headers)
         
     except Exception as e:
         logger.exception("Error retrieving products", extra={"error": str(e)})
         return create_response(500, {"message": "Error retrieving products"})
 
-@log_request
 def get_product(event: dict, context: LambdaContext) -> dict:
     """Gets a specific product by ID."""
     try:
-        product_id = event.get('pathParameters', {}).get('id')
-        if not product_id:
-            logger.warning("Missing product ID")
-            return create_response(400, {"message": "Product ID is required"})
+        db = _get_db()
+        pid, error = _require_oid(event)
+        if error:
+            return error
+        product_id = str(pid)
 
         logger.info("Retrieving product", extra={"product_id": product_id})
-        
-        try:
-            product = db.products.find_one({"_id": ObjectId(product_id)})
-        except:
-            logger.warning("Invalid product ID format", extra={"product_id": product_id})
-            return create_response(400, {"message": "Invalid product ID format"})
+
+        product = db.products.find_one({"_id": pid})
 
         if not product:
             logger.warning("Product not found", extra={"product_id": product_id})
@@ -134,39 +257,37 @@ def get_product(event: dict, context: LambdaContext) -> dict:
 
         product["id"] = str(product.pop("_id"))
         
-        logger.info("Product retrieved successfully", extra={"product_id": product_id})
+        logger.debug("Product retrieved successfully", extra={"product_id": product_id})
         return create_response(200, product)
         
     except Exception as e:
         logger.exception("Error retrieving product", extra={"error": str(e)})
         return create_response(500, {"message": "Error retrieving product"})
 
-@log_request
 def create_product(event: dict, context: LambdaContext) -> dict:
     """Creates a new product."""
     try:
-        if isinstance(event.get('body'), str):
-            product_data = json.loads(event['body'])
-        else:
-            product_data = event.get('body', {})
-            
+        db = _get_db()
+        product_data = _parse_body(event, _PRODUCT_REQUIRED)
+
         logger.info("Creating new product", extra={"product_data": product_data})
-        
-        required_fields = ['name', 'sku', 'price']
-        validate_fields(product_data, required_fields)
-        
-        existing_product = db.products.find_one({"sku": product_data['sku']})
-        if existing_product:
+
+        from pymongo.errors import DuplicateKeyError
+
+        # The unique sku index enforces uniqueness; catching the duplicate
+        # on insert saves the pre-insert lookup round trip
+        try:
+            result = db.products.insert_one(product_data)
+        except DuplicateKeyError:
             logger.warning("Duplicate SKU", extra={"sku": product_data['sku']})
             return create_response(400, {"message": "SKU already exists"})
         
-        result = db.products.insert_one(product_data)
-        
-        logger.info("Product created successfully", extra={
+        _invalidate_product_cache()
+        logger.debug("Product created successfully", extra={
             "product_id": str(result.inserted_id),
             "sku": product_data['sku']
         })
-        
+
         return create_response(201, {
             "message": "Product created successfully",
             "id": str(result.inserted_id)
@@ -179,39 +300,30 @@ def create_product(event: dict, context: LambdaContext) -> dict:
         logger.exception("Error creating product", extra={"error": str(e)})
         return create_response(500, {"message": "Error creating product"})
 
-@log_request
 def update_product(event: dict, context: LambdaContext) -> dict:
     """Updates an existing product."""
     try:
-        product_id = event.get('pathParameters', {}).get('id')
-        if not product_id:
-            logger.warning("Missing product ID")
-            return create_response(400, {"message": "Product ID is required"})
+        db = _get_db()
+        pid, error = _require_oid(event)
+        if error:
+            return error
+        product_id = str(pid)
+
+        update_data = _parse_body(event)
 
-        if isinstance(event.get('body'), str):
-            update_data = json.loads(event['body'])
-        else:
-            update_data = event.get('body', {})
-            
         logger.info("Updating product", extra={
             "product_id": product_id,
             "update_data": update_data
         })
-        
-        try:
-            result = db.products.update_one(
-                {"_id": ObjectId(product_id)},
-                {"$set": update_data}
-            )
-        except:
-            logger.warning("Invalid product ID format", extra={"product_id": product_id})
-            return create_response(400, {"message": "Invalid product ID format"})
+
+        result = db.products.update_one({"_id": pid}, {"$set": update_data})
 
         if result.matched_count == 0:
             logger.warning("Product not found", extra={"product_id": product_id})
             return create_response(404, {"message": "Product not found"})
             
-        logger.info("Product updated successfully", extra={
+        _invalidate_product_cache()
+        logger.debug("Product updated successfully", extra={
             "product_id": product_id,
             "modified_count": result.modified_count
         })
@@ -221,28 +333,33 @@ def update_product(event: dict, context: LambdaContext) -> dict:
         logger.exception("Error updating product", extra={"error": str(e)})
         return create_response(500, {"message": "Error updating product"})
 
-@log_request
 def delete_product(event: dict, context: LambdaContext) -> dict:
     """Deletes a product by ID."""
     try:
-        product_id = event.get('pathParameters', {}).get('id')
-        if not product_id:
-            logger.warning("Missing product ID")
-            return create_response(400, {"message": "Product ID is required"})
+        db = _get_db()
+        pid_obj, error = _require_oid(event)
+        if error:
+            return error
+        product_id = str(pid_obj)
 
         logger.info("Deleting product", extra={"product_id": product_id})
-        
-        try:
-            result = db.products.delete_one({"_id": ObjectId(product_id)})
-        except:
-            logger.warning("Invalid product ID format", extra={"product_id": product_id})
-            return create_response(400, {"message": "Invalid product ID format"})
+
+        # productId is stored as an ObjectId; querying with the parsed id
+        # keeps this an indexed point lookup instead of a never-matching scan
+        if db.inventory.find_one({"productId": pid_obj}, {"_id": 1}):
+            logger.warning("Product still referenced by inventory", extra={
+                "product_id": product_id
+            })
+            return create_response(400, {"message": "Cannot delete product that exists in inventory"})
+
+        result = db.products.delete_one({"_id": pid_obj})
 
         if result.deleted_count == 0:
             logger.warning("Product not found", extra={"product_id": product_id})
             return create_response(404, {"message": "Product not found"})
 
-        logger.info("Product deleted successfully", extra={"product_id": product_id})
+        _invalidate_product_cache()
+        logger.debug("Product deleted successfully", extra={"product_id": product_id})
         return create_response(200, {"message": "Product deleted successfully"})
         
     except Exception as e:
@@ -250,34 +367,43 @@ def delete_product(event: dict, context: LambdaContext) -> dict:
         return create_response(500, {"message": "Error deleting product"})
 
 # Inventory Management Functions
-@log_request
 def create_inventory(event: dict, context: LambdaContext) -> dict:
     """Creates a new inventory entry."""
     try:
-        if isinstance(event.get('body'), str):
-            inventory_data = json.loads(event['body'])
-        else:
-            inventory_data = event.get('body', {})
-            
+        db = _get_db()
+        inventory_data = _parse_body(event, _INVENTORY_REQUIRED)
+
         logger.info("Creating inventory entry", extra={"inventory_data": inventory_data})
-        
-        required_fields = ['productId', 'storeId', 'quantity', 'minStock']
-        validate_fields(inventory_data, required_fields)
-        
-        # Validate product exists
-        try:
-            product = db.products.find_one({"_id": ObjectId(inventory_data['productId'])})
-            if not product:
-                logger.warning("Product not found", extra={"product_id": inventory_data['productId']})
-                return create_response(404, {"message": "Product not found"})
-        except:
+
+        from datetime import datetime
+
+        pid = _parse_oid(inventory_data['productId'])
+        if pid is None:
             logger.warning("Invalid product ID format", extra={"product_id": inventory_data['productId']})
             return create_response(400, {"message": "Invalid product ID format"})
-        
+
+        # Validate product exists
+        if not db.products.find_one({"_id": pid}, {"_id": 1}):
+            logger.warning("Product not found", extra={"product_id": inventory_data['productId']})
+            return create_response(404, {"message": "Product not found"})
+
+        from pymongo.errors import DuplicateKeyError
+
         inventory_data['createdAt'] = datetime.utcnow()
-        result = db.inventory.insert_one(inventory_data)
+        # Denormalized alert flag kept in sync on every inventory write so
+        # get_stock_alerts can use an indexed equality match
+        inventory_data['lowStock'] = inventory_data['quantity'] <= inventory_data['minStock']
+        # The unique (productId, storeId) index rejects duplicates on insert
+        try:
+            result = db.inventory.insert_one(inventory_data)
+        except DuplicateKeyError:
+            logger.warning("Duplicate inventory entry", extra={
+                "product_id": inventory_data['productId'],
+                "store_id": inventory_data['storeId']
+            })
+            return create_response(400, {"message": "Inventory entry already exists"})
         
-        logger.info("Inventory entry created successfully", extra={
+        logger.debug("Inventory entry created successfully", extra={
             "inventory_id": str(result.inserted_id)
         })
         
@@ -293,10 +419,10 @@ def create_inventory(event: dict, context: LambdaContext) -> dict:
         logger.exception("Error creating inventory entry", extra={"error": str(e)})
         return create_response(500, {"message": "Error creating inventory entry"})
 
-@log_request
 def get_store_inventory(event: dict, context: LambdaContext) -> dict:
     """Gets inventory for a specific store."""
     try:
+        db = _get_db()
         store_id = event.get('pathParameters', {}).get('id')
         if not store_id:
             logger.warning("Missing store ID")
@@ -304,102 +430,118 @@ def get_store_inventory(event: dict, context: LambdaContext) -> dict:
 
         logger.info("Retrieving store inventory", extra={"store_id": store_id})
         
+        # Sub-pipeline lookup projects the product fields at the source and
+        # $first flattens the single match, skipping the array that
+        # $lookup + $unwind used to materialize per document
         pipeline = [
             {"$match": {"storeId": store_id}},
             {
                 "$lookup": {
                     "from": "products",
-                    "localField": "productId",
-                    "foreignField": "_id",
+                    "let": {"pid": "$productId"},
+                    "pipeline": [
+                        {"$match": {"$expr": {"$eq": ["$_id", "$$pid"]}}},
+                        {"$project": {"name": 1, "sku": 1, "price": 1, "_id": 0}}
+                    ],
                     "as": "product"
                 }
             },
-            {"$unwind": "$product"},
             {
                 "$project": {
                     "id": {"$toString": "$_id"},
                     "quantity": 1,
                     "minStock": 1,
-                    "product.name": 1,
-                    "product.sku": 1,
-                    "product.price": 1,
+                    "product": {"$first": "$product"},
                     "_id": 0
                 }
             }
         ]
         
-        inventory = list(db.inventory.aggregate(pipeline))
-        
-        logger.info("Store inventory retrieved successfully", extra={
-            "store_id": store_id,
-            "count": len(inventory)
-        })
-        return create_response(200, inventory)
+        body = _stream_json_array(db.inventory.aggregate(pipeline, batchSize=500))
+
+        return create_json_response(200, body)
         
     except Exception as e:
         logger.exception("Error retrieving store inventory", extra={"error": str(e)})
         return create_response(500, {"message": "Error retrieving store inventory"})
 
-@log_request
 def transfer_stock(event: dict, context: LambdaContext) -> dict:
     """Transfers stock between stores."""
     try:
-        if isinstance(event.get('body'), str):
-            transfer_data = json.loads(event['body'])
-        else:
-            transfer_data = event.get('body', {})
-            
+        db = _get_db()
+        transfer_data = _parse_body(event, _TRANSFER_REQUIRED)
+
         logger.info("Processing stock transfer", extra={"transfer_data": transfer_data})
-        
-        required_fields = ['productId', 'sourceStoreId', 'targetStoreId', 'quantity']
-        validate_fields(transfer_data, required_fields)
-        
+
+        from datetime import datetime
+
         # Validate quantity is positive
         if transfer_data['quantity'] <= 0:
             logger.warning("Invalid quantity", extra={"quantity": transfer_data['quantity']})
             return create_response(400, {"message": "Quantity must be positive"})
-        
-        # Check source store has enough stock
-        source_inventory = db.inventory.find_one({
-            "productId": ObjectId(transfer_data['productId']),
-            "storeId": transfer_data['sourceStoreId']
-        })
-        
-        if not source_inventory or source_inventory['quantity'] < transfer_data['quantity']:
+
+        pid = _parse_oid(transfer_data['productId'])
+        if pid is None:
+            logger.warning("Invalid product ID format", extra={"product_id": transfer_data['productId']})
+            return create_response(400, {"message": "Invalid product ID format"})
+        quantity = transfer_data['quantity']
+
+        # Atomic conditional decrement: either the source has enough stock
+        # and is decremented in the same server-side step, or nothing
+        # matches and no state has changed. Projecting minStock lets the
+        # target upsert inherit the source's threshold instead of 0.
+        source = db.inventory.find_one_and_update(
+            {
+                "productId": pid,
+                "storeId": transfer_data['sourceStoreId'],
+                "quantity": {"$gte": quantity}
+            },
+            # Pipeline update so the denormalized lowStock flag is
+            # recomputed in the same atomic step as the decrement
+            [{
+                "$set": {
+                    "quantity": {"$subtract": ["$quantity", quantity]},
+                    "lowStock": {
+                        "$lte": [{"$subtract": ["$quantity", quantity]}, "$minStock"]
+                    }
+                }
+            }],
+            projection={"minStock": 1, "_id": 0}
+        )
+
+        if source is None:
             logger.warning("Insufficient stock", extra={
                 "store_id": transfer_data['sourceStoreId'],
                 "product_id": transfer_data['productId']
             })
             return create_response(400, {"message": "Insufficient stock"})
-        
-        # Perform transfer
-        db.inventory.update_one(
-            {
-                "productId": ObjectId(transfer_data['productId']),
-                "storeId": transfer_data['sourceStoreId']
-            },
-            {"$inc": {"quantity": -transfer_data['quantity']}}
-        )
-        
+
+        # Pipeline upsert: $ifNull stands in for $setOnInsert (unavailable
+        # in pipeline updates) and lowStock is recomputed from the new total
+        target_min_stock = source.get("minStock", 0)
+        new_quantity = {"$add": [{"$ifNull": ["$quantity", 0]}, quantity]}
         db.inventory.update_one(
             {
-                "productId": ObjectId(transfer_data['productId']),
+                "productId": pid,
                 "storeId": transfer_data['targetStoreId']
             },
-            {
-                "$inc": {"quantity": transfer_data['quantity']},
-                "$setOnInsert": {
-                    "minStock": source_inventory['minStock'],
-                    "createdAt": datetime.utcnow()
+            [{
+                "$set": {
+                    "quantity": new_quantity,
+                    "minStock": {"$ifNull": ["$minStock", target_min_stock]},
+                    "createdAt": {"$ifNull": ["$createdAt", "$$NOW"]},
+                    "lowStock": {
+                        "$lte": [new_quantity, {"$ifNull": ["$minStock", target_min_stock]}]
+                    }
                 }
-            },
+            }],
             upsert=True
         )
-        
+
         # Record movement
         movement = {
-            "type": MovementType.TRANSFER.value,
-            "productId": ObjectId(transfer_data['productId']),
+            "type": MovementType.TRANSFER,
+            "productId": pid,
             "sourceStoreId": transfer_data['sourceStoreId'],
             "targetStoreId": transfer_data['targetStoreId'],
             "quantity": transfer_data['quantity'],
@@ -407,7 +549,7 @@ def transfer_stock(event: dict, context: LambdaContext) -> dict:
         }
         db.movements.insert_one(movement)
         
-        logger.info("Stock transfer completed successfully", extra={
+        logger.debug("Stock transfer completed successfully", extra={
             "source_store": transfer_data['sourceStoreId'],
             "target_store": transfer_data['targetStoreId'],
             "quantity": transfer_data['quantity']
@@ -422,44 +564,54 @@ def transfer_stock(event: dict, context: LambdaContext) -> dict:
         logger.exception("Error processing stock transfer", extra={"error": str(e)})
         return create_response(500, {"message": "Error processing stock transfer"})
 
-@log_request
 def get_stock_alerts(event: dict, context: LambdaContext) -> dict:
     """Gets low stock alerts."""
     try:
+        db = _get_db()
         logger.info("Retrieving low stock alerts")
         
+        # $facet yields the alert documents and their count from a single
+        # pass over the matched inventory, so callers that only need the
+        # badge count no longer trigger a second aggregation
+        # lowStock is maintained on every inventory write, so this match is
+        # a partial-index equality scan over only the alerting rows instead
+        # of a full-collection $expr evaluation
         pipeline = [
+            {"$match": {"lowStock": True}},
             {
-                "$match": {
-                    "$expr": {"$lte": ["$quantity", "$minStock"]}
-                }
-            },
-            {
-                "$lookup": {
-                    "from": "products",
-                    "localField": "productId",
-                    "foreignField": "_id",
-                    "as": "product"
-                }
-            },
-            {"$unwind": "$product"},
-            {
-                "$project": {
-                    "id": {"$toString": "$_id"},
-                    "storeId": 1,
-                    "quantity": 1,
-                    "minStock": 1,
-                    "product.name": 1,
-                    "product.sku": 1,
-                    "_id": 0
+                "$facet": {
+                    "items": [
+                        {
+                            "$lookup": {
+                                "from": "products",
+                                "let": {"pid": "$productId"},
+                                "pipeline": [
+                                    {"$match": {"$expr": {"$eq": ["$_id", "$$pid"]}}},
+                                    {"$project": {"name": 1, "sku": 1, "_id": 0}}
+                                ],
+                                "as": "product"
+                            }
+                        },
+                        {
+                            "$project": {
+                                "id": {"$toString": "$_id"},
+                                "storeId": 1,
+                                "quantity": 1,
+                                "minStock": 1,
+                                "product": {"$first": "$product"},
+                                "_id": 0
+                            }
+                        }
+                    ],
+                    "totalCount": [{"$count": "n"}]
                 }
             }
         ]
-        
-        alerts = list(db.inventory.aggregate(pipeline))
-        
-        logger.info("Low stock alerts retrieved successfully", extra={"count": len(alerts)})
-        return create_response(200, alerts)
+
+        facets = next(iter(db.inventory.aggregate(pipeline)))
+        count = facets["totalCount"][0]["n"] if facets["totalCount"] else 0
+
+        return create_response(200, {"items": facets["items"], "count": count})
         
     except Exception as e:
         logger.exception("Error retrieving stock alerts", extra={"error": str(e)})
@@ -477,3 +629,14 @@ function_map = {
     "StockTransfer": transfer_stock,
     "StockAlerts": get_stock_alerts
 }
+
+# FUNCTION_NAME is fixed for the life of the container, so the handler is
+# resolved once at import instead of per invocation
+_FUNCTION_NAME = os.environ.get('FUNCTION_NAME')
+_HANDLER = function_map.get(_FUNCTION_NAME)
+if _HANDLER is None:
+    # Surface the misconfiguration once at cold start; every invocation on
+    # this container would otherwise fail with a per-request 400
+    logger.error("FUNCTION_NAME does not match any handler", extra={
+        "function_name": _FUNCTION_NAME
+    })
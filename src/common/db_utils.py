@@ -3,24 +3,49 @@ from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
 from aws_lambda_powertools import Logger
 import os
-import sys
 
 # Initialize logger
 logger = Logger(service="inventory-management", child=True)
 
-def get_mongo_client():
+# One client per container: every caller of get_mongo_client(lazy=True)
+# shares this instance, so the TCP+TLS+auth handshake happens once and
+# Atlas sees one connection per Lambda container instead of one per call
+_lazy_client = None
+
+def get_mongo_client(lazy=False):
+    global _lazy_client
+    if lazy and _lazy_client is not None:
+        return _lazy_client
     try:
         # Get MongoDB URI from environment variables
         mongo_uri = os.getenv("MONGO_DB_URI")
-        
+
         if not mongo_uri:
-            logger.error("MONGO_DB_URI environment variable is not set", 
-                        extra={"environment_variables": dict(os.environ)})
+            logger.error("MONGO_DB_URI environment variable is not set")
             raise ValueError("MONGO_DB_URI environment variable is not set")
 
-        logger.info("Attempting to connect to MongoDB", 
+        logger.info("Attempting to connect to MongoDB",
                    extra={"mongodb_uri": mongo_uri})
-        
+
+        if lazy:
+            # Lambda-friendly client: no connection until the first query,
+            # a single pooled socket reused across warm invocations, and
+            # no eager ping so module init stays off the network. Lambda
+            # runs one request per container, so a pool of exactly one
+            # socket kept alive just under Atlas's 5-minute idle reaper
+            # amortizes the TCP+TLS+auth handshake across invocations.
+            _lazy_client = MongoClient(
+                mongo_uri,
+                maxPoolSize=1,
+                minPoolSize=1,
+                maxIdleTimeMS=270000,
+                connect=False,
+                retryWrites=True,
+                socketTimeoutMS=5000,
+                serverSelectionTimeoutMS=3000
+            )
+            return _lazy_client
+
         # Create MongoDB client with timeout settings
         client = MongoClient(
             mongo_uri,
@@ -28,7 +53,7 @@ def get_mongo_client():
             connectTimeoutMS=5000,
             socketTimeoutMS=5000
         )
-        
+
         # Test the connection
         try:
             logger.debug("Testing MongoDB connection...")
@@ -45,35 +70,6 @@ def get_mongo_client():
             raise
 
     except Exception as e:
-        logger.error("Failed to connect to MongoDB", 
-                    extra={
-                        "error": str(e),
-                        "cwd": os.getcwd(),
-                        "python_path": sys.path,
-                        "mongodb_uri": mongo_uri
-                    })
-        
-        # Check if MongoDB is accessible on the network
-        import socket
-        try:
-            host = mongo_uri.split('@')[-1].split(':')[0] if '@' in mongo_uri else mongo_uri.split('//')[1].split(':')[0]
-            port = int(mongo_uri.split(':')[-1].split('/')[0]) if ':' in mongo_uri else 27017
-            
-            logger.debug("Checking MongoDB port accessibility", 
-                        extra={"host": host, "port": port})
-            
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(2)
-            result = sock.connect_ex((host, port))
-            if result == 0:
-                logger.info("MongoDB port is accessible", 
-                           extra={"host": host, "port": port})
-            else:
-                logger.error("MongoDB port is not accessible", 
-                            extra={"host": host, "port": port})
-            sock.close()
-        except Exception as socket_error:
-            logger.error("Error checking MongoDB port", 
-                        extra={"error": str(socket_error)})
-        
+        logger.error("Failed to connect to MongoDB",
+                    extra={"error": str(e), "mongodb_uri": mongo_uri})
         raise
@@ -2,6 +2,8 @@
 Logging decorator module using AWS Lambda Powertools.
 """
 
+import logging
+
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.logging import correlation_paths
 from aws_lambda_powertools.utilities.typing import LambdaContext
@@ -14,7 +16,15 @@ logger = Logger(service="inventory-management")
 def log_request(func: Callable) -> Callable:
     """
     Decorator to add structured logging for Lambda function requests.
+
+    When the configured level is above INFO every record this wrapper
+    emits would be suppressed anyway, so the decorator returns the
+    function untouched and the per-request append_keys/serialization
+    cost disappears. Decoration happens at import, and LOG_LEVEL is
+    fixed for the life of the container, so the check runs once.
     """
+    if logger.log_level > logging.INFO:
+        return func
     @logger.inject_lambda_context(correlation_id_path=correlation_paths.API_GATEWAY_REST)
     @wraps(func)
     def wrapper(event: Dict[str, Any], context: LambdaContext) -> Dict[str, Any]:
@@ -5,6 +5,8 @@ This module provides a mock implementation of the AWS Lambda context object
 for local testing and development.
 """
 
+from types import MappingProxyType
+
 class MockContext:
     """
     Mock AWS Lambda Context object that mimics the behavior and attributes
@@ -22,6 +24,19 @@ class MockContext:
         client_context (dict): Mobile client information
     """
 
+    __slots__ = (
+        "function_name",
+        "function_version",
+        "memory_limit_in_mb",
+        "invoked_function_arn",
+        "aws_request_id",
+        "log_group_name",
+        "log_stream_name",
+        "_remaining_time_in_millis",
+        "identity",
+        "client_context",
+    )
+
     def __init__(
         self,
         function_name: str = "test-function",
@@ -117,6 +132,8 @@ class CognitoIdentity:
     Mock Cognito identity information for testing authentication scenarios.
     """
 
+    __slots__ = ("cognito_identity_id", "cognito_identity_pool_id")
+
     def __init__(
         self,
         cognito_identity_id: str = "test-identity-id",
@@ -137,6 +154,19 @@ class ClientContext:
     Mock client context for testing mobile SDK integrations.
     """
 
+    __slots__ = ("client", "custom", "env")
+
+    # Read-only defaults shared across instances; building the 5-entry
+    # client dict per ClientContext() was pure allocation overhead
+    _DEFAULT_CLIENT = MappingProxyType({
+        "installation_id": "test-installation-id",
+        "app_title": "test-app",
+        "app_version_name": "1.0.0",
+        "app_version_code": "1",
+        "app_package_name": "com.test.app"
+    })
+    _EMPTY = MappingProxyType({})
+
     def __init__(
         self,
         client: dict = None,
@@ -151,15 +181,15 @@ class ClientContext:
             custom (dict): Custom values
             env (dict): Environment information
         """
-        self.client = client or {
-            "installation_id": "test-installation-id",
-            "app_title": "test-app",
-            "app_version_name": "1.0.0",
-            "app_version_code": "1",
-            "app_package_name": "com.test.app"
-        }
-        self.custom = custom or {}
-        self.env = env or {}
+        self.client = client if client is not None else self._DEFAULT_CLIENT
+        self.custom = custom if custom is not None else self._EMPTY
+        self.env = env if env is not None else self._EMPTY
+
+# Shared default instances: the defaults never vary, so create_test_context
+# hands out these references instead of allocating per call. Tests that
+# need to mutate identity or client context should construct their own.
+_DEFAULT_COGNITO = CognitoIdentity()
+_DEFAULT_CLIENT_CONTEXT = ClientContext()
 
 def create_test_context(
     function_name: str = "test-function",
@@ -180,9 +210,9 @@ def create_test_context(
     context = MockContext(function_name)
     
     if with_cognito:
-        context.identity = CognitoIdentity()
-        
+        context.identity = _DEFAULT_COGNITO
+
     if with_client_context:
-        context.client_context = ClientContext()
-        
+        context.client_context = _DEFAULT_CLIENT_CONTEXT
+
     return context
@@ -0,0 +1,302 @@
+"""
+Shared Locust user definition for the Inventory Management System API.
+
+Both locustfiles import `InventoryManagementUser` from here so there is a
+single canonical task set: the copies had already drifted (one lost its
+catch_response handling), and keeping the class in one module means a
+harness that loads both files only compiles the tasks once.
+"""
+
+from locust import events, task, between
+from locust.contrib.fasthttp import FastHttpUser
+from random import Random
+import json
+import logging
+import os
+
+import orjson
+
+# Configure logging; WARNING keeps per-task records out of the
+# generator's hot path - Locust's own stats cover throughput
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+# Status-only stress mode: skip response JSON parsing so the generator
+# spends its CPU on driving requests; leave unset for validation runs
+STRESS_MODE = os.environ.get("LOCUST_STRESS", "0") == "1"
+
+# Shared header dict for pre-serialized bodies; orjson.dumps + data= skips
+# the json.dumps pass inside the HTTP client on every POST/PUT
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Populated once per process at test start; users copy it instead of each
+# issuing their own warm-up GET /products during ramp-up
+_GLOBAL_PRODUCT_IDS = []
+
+@events.test_start.add_listener
+def _warm_product_ids(environment, **kwargs):
+    """Fetches the product list once so O(users) warm-up GETs become O(1)."""
+    if not environment.host:
+        return
+    try:
+        import requests
+        resp = requests.get(environment.host + "/products", timeout=10)
+        if resp.ok:
+            _GLOBAL_PRODUCT_IDS[:] = [p["id"] for p in orjson.loads(resp.content)]
+    except Exception:
+        logger.warning("Product warm-up fetch failed; users start with empty id lists")
+
+class InventoryManagementUser(FastHttpUser):
+    """
+    Simulates user behavior for load testing the Inventory Management System API.
+    Includes all endpoints defined in the SAM template.
+    """
+    
+    # Wait 1-5 seconds between tasks
+    wait_time = between(1, 5)
+    # geventhttpclient timeouts; the FastHttp session reuses one
+    # persistent connection pool per user
+    network_timeout = 10.0
+    connection_timeout = 10.0
+    # One in-flight request per user means each user pins a single
+    # kept-alive connection, so no request pays a fresh TCP+TLS
+    # handshake after the first
+    concurrency = 1
+    
+    def on_start(self):
+        """
+        Initialize test data and state when user starts.
+        Sets up sample products and store IDs.
+        """
+        # Per-user RNG: avoids the shared random module state that
+        # every greenlet would otherwise contend on
+        self._rng = Random()
+        # Product templates as tuples; create_product builds the final
+        # payload in a single dict literal instead of copying and mutating
+        # a template dict per call
+        self._product_templates = [
+            ("Steel Bar Type A", "High-quality steel bar for construction",
+             "raw_materials", 29.99, "STL"),
+            ("Iron Rod Type B", "Standard iron rod for industrial use",
+             "raw_materials", 19.99, "IRN"),
+            ("Copper Wire Type C", "Premium copper wire for electrical use",
+             "raw_materials", 39.99, "CPR"),
+        ]
+        # Track created products for other operations
+        self.created_product_ids = []
+        # Pre-formatted /products/{id} URLs, kept in step with the id
+        # list so hot tasks skip the per-call f-string
+        self._urls = {}
+        # Sample store IDs for inventory operations
+        self.store_ids = ["store001", "store002", "store003"]
+        # Per-source alternatives precomputed once so transfer_stock
+        # skips a list comprehension on every call
+        self._other_stores = {
+            s: tuple(x for x in self.store_ids if x != s)
+            for s in self.store_ids
+        }
+        # Seed ids from the per-process warm-up fetch; the periodic
+        # get_products task keeps them fresh from there
+        self.created_product_ids = list(_GLOBAL_PRODUCT_IDS)
+        self._urls = {pid: f"/products/{pid}" for pid in self.created_product_ids}
+
+    # Product Management Tasks
+    @task(3)
+    def get_products(self):
+        """List all products"""
+        with self.client.get("/products", catch_response=True) as response:
+            if response.status_code == 200:
+                if not STRESS_MODE:
+                    # orjson parses the raw bytes directly, ~3x faster
+                    # than the client's stdlib-json .json() helper
+                    products = orjson.loads(response.content)
+                    if products and isinstance(products, list):
+                        self.created_product_ids = [p['id'] for p in products]
+                        self._urls = {pid: f"/products/{pid}" for pid in self.created_product_ids}
+                response.success()
+            else:
+                response.failure(f"Get products failed with status {response.status_code}")
+
+    @task(2)
+    def get_single_product(self):
+        """Get a single product by ID"""
+        if not self.created_product_ids:
+            return
+
+        product_id = self._rng.choice(self.created_product_ids)
+        url = self._urls.get(product_id) or f"/products/{product_id}"
+        with self.client.get(
+            url,
+            catch_response=True
+        ) as response:
+            if response.status_code == 200:
+                response.success()
+            elif response.status_code == 404:
+                # Remove non-existent product ID from our list
+                self.created_product_ids.remove(product_id)
+                self._urls.pop(product_id, None)
+                response.failure(f"Product {product_id} not found")
+            else:
+                response.failure(f"Get product failed with status {response.status_code}")
+
+    @task(1)
+    def create_product(self):
+        """Create a new product"""
+        name, description, category, price, prefix = self._rng.choice(self._product_templates)
+        product_data = {
+            "name": name,
+            "description": description,
+            "category": category,
+            "price": price,
+            "sku": f"{prefix}{self._rng.randint(1000, 9999)}{self._rng.randint(1000, 9999)}"
+        }
+        
+        with self.client.post(
+            "/products",
+            data=orjson.dumps(product_data),
+            headers=_JSON_HEADERS,
+            catch_response=True
+        ) as response:
+            if response.status_code == 201:
+                if STRESS_MODE:
+                    response.success()
+                    return
+                try:
+                    result = response.json()
+                    if 'id' in result:
+                        self.created_product_ids.append(result['id'])
+                        self._urls[result['id']] = f"/products/{result['id']}"
+                        response.success()
+                    else:
+                        response.failure("No product ID in response")
+                except json.JSONDecodeError:
+                    response.failure("Invalid JSON response")
+            else:
+                response.failure(f"Create product failed with status {response.status_code}")
+
+    @task(1)
+    def update_product(self):
+        """Update an existing product"""
+        if not self.created_product_ids:
+            return
+
+        product_id = self._rng.choice(self.created_product_ids)
+        update_data = {
+            "price": round(self._rng.randint(1000, 5000) / 100, 2),
+            "description": f"Updated description {self._rng.randint(1, 1000)}"
+        }
+        
+        url = self._urls.get(product_id) or f"/products/{product_id}"
+        with self.client.put(
+            url,
+            data=orjson.dumps(update_data),
+            headers=_JSON_HEADERS,
+            catch_response=True
+        ) as response:
+            if response.status_code == 200:
+                response.success()
+            elif response.status_code == 404:
+                self.created_product_ids.remove(product_id)
+                self._urls.pop(product_id, None)
+                response.failure(f"Product {product_id} not found")
+            else:
+                response.failure(f"Update product failed with status {response.status_code}")
+
+    @task(1)
+    def delete_product(self):
+        """Delete a product"""
+        if not self.created_product_ids:
+            return
+
+        product_id = self._rng.choice(self.created_product_ids)
+        url = self._urls.get(product_id) or f"/products/{product_id}"
+        with self.client.delete(
+            url,
+            catch_response=True
+        ) as response:
+            if response.status_code == 200:
+                self.created_product_ids.remove(product_id)
+                self._urls.pop(product_id, None)
+                response.success()
+            elif response.status_code == 404:
+                self.created_product_ids.remove(product_id)
+                self._urls.pop(product_id, None)
+                response.failure(f"Product {product_id} not found")
+            else:
+                response.failure(f"Delete product failed with status {response.status_code}")
+
+    # Inventory Management Tasks
+    @task(2)
+    def create_inventory(self):
+        """Create inventory entry"""
+        if not self.created_product_ids:
+            return
+
+        inventory_data = {
+            "productId": self._rng.choice(self.created_product_ids),
+            "storeId": self._rng.choice(self.store_ids),
+            "quantity": self._rng.randint(50, 200),
+            "minStock": self._rng.randint(10, 30)
+        }
+        
+        with self.client.post(
+            "/inventory",
+            data=orjson.dumps(inventory_data),
+            headers=_JSON_HEADERS,
+            catch_response=True
+        ) as response:
+            if response.status_code in [200, 201]:
+                response.success()
+            else:
+                response.failure(f"Create inventory failed with status {response.status_code}")
+
+    @task(2)
+    def get_store_inventory(self):
+        """Get store inventory"""
+        store_id = self._rng.choice(self.store_ids)
+        with self.client.get(
+            f"/stores/{store_id}/inventory",
+            catch_response=True
+        ) as response:
+            if response.status_code == 200:
+                response.success()
+            else:
+                response.failure(f"Get store inventory failed with status {response.status_code}")
+
+    @task(1)
+    def transfer_stock(self):
+        """Transfer stock between stores"""
+        if not self.created_product_ids:
+            return
+
+        source_store = self._rng.choice(self.store_ids)
+        target_store = self._rng.choice(self._other_stores[source_store])
+        transfer_data = {
+            "productId": self._rng.choice(self.created_product_ids),
+            "sourceStoreId": source_store,
+            "targetStoreId": target_store,
+            "quantity": self._rng.randint(5, 20)
+        }
+        
+        with self.client.post(
+            "/inventory/transfer",
+            data=orjson.dumps(transfer_data),
+            headers=_JSON_HEADERS,
+            catch_response=True
+        ) as response:
+            if response.status_code == 200:
+                response.success()
+            else:
+                response.failure(f"Transfer stock failed with status {response.status_code}")
+
+    @task(1)
+    def check_stock_alerts(self):
+        """Check low stock alerts"""
+        with self.client.get(
+            "/inventory/alert",
+            catch_response=True
+        ) as response:
+            if response.status_code == 200:
+                response.success()
+            else:
+                response.failure(f"Check stock alerts failed with status {response.status_code}")
@@ -1,10 +1,27 @@
 # tests/unit/conftest.py
+import copy
+
 import pytest
 from unittest.mock import Mock
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_db():
-    db = Mock()
-    db.products = Mock()
-    db.inventory = Mock()
-    return db
+    # One mock per test module; children (.products, .inventory, ...) are
+    # auto-created on first access, which registers them so the per-test
+    # reset below reaches every configured return_value/side_effect
+    return Mock()
+
+@pytest.fixture(autouse=True)
+def _reset_mock_db(mock_db):
+    mock_db.reset_mock(return_value=True, side_effect=True)
+
+@pytest.fixture(scope="session")
+def _base_context():
+    # Built once per session; the ARN/log-group f-strings only run here
+    from tests.context import MockContext
+    return MockContext()
+
+@pytest.fixture
+def mock_context(_base_context):
+    # Shallow copy so a test can mutate its context without leaking state
+    return copy.copy(_base_context)
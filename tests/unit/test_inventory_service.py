@@ -1,23 +1,50 @@
 # tests/unit/test_inventory_service.py
+import re
+from types import MappingProxyType
+
 import pytest
 from bson import ObjectId
-from unittest.mock import Mock, MagicMock
+from unittest.mock import MagicMock
 
 from services.inventory_service import InventoryService
 
+# Shared ids built once at import: most tests only need "some valid
+# ObjectId", so there is no reason to pay an ObjectId() construction
+# (urandom + counter) per test. _OIDS covers tests needing distinct ids.
+_PID = ObjectId()
+_PID_STR = str(_PID)
+_OIDS = tuple(ObjectId() for _ in range(4))
+_OID_STRS = tuple(str(oid) for oid in _OIDS)
+
+# Frozen return-value templates shared across tests; safe because the
+# service reads these documents without mutating them. Aggregate results
+# stay per-test dicts - get_all_stock_with_product rewrites productId
+# in place.
+_PRODUCT_DOC = MappingProxyType({"_id": _PID})
+_STOCK_100 = MappingProxyType({"productId": _PID, "quantity": 100})
+
+# pytest.raises accepts precompiled patterns; messages asserted by more
+# than one test are compiled once here instead of per raises call
+_RE_NOT_FOUND = re.compile("Product not found")
+_RE_POSITIVE_QTY = re.compile("Quantity must be a positive number")
+_RE_RETRIEVING_INV = re.compile("Error retrieving inventory")
+
 class TestInventoryService:
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def inventory_service(self, mock_db):
         return InventoryService(mock_db)
 
+    @pytest.fixture(autouse=True)
+    def _reset_service(self, inventory_service):
+        # The service memoizes product-existence checks per instance;
+        # a module-scoped instance must not carry that across tests
+        inventory_service._exists_cache.clear()
+
     def test_get_product_stock_success(self, inventory_service, mock_db):
         # Arrange
-        product_id = str(ObjectId())
-        mock_db.products.find_one.return_value = {"_id": ObjectId(product_id)}
-        mock_db.inventory.find_one.return_value = {
-            "productId": ObjectId(product_id),
-            "quantity": 100
-        }
+        product_id = _PID_STR
+        mock_db.products.find_one.return_value = _PRODUCT_DOC
+        mock_db.inventory.find_one.return_value = _STOCK_100
 
         # Act
         result = inventory_service.get_product_stock(product_id)
@@ -28,18 +55,17 @@ class TestInventoryService:
 
     def test_get_product_stock_not_found(self, inventory_service, mock_db):
         # Arrange
-        product_id = str(ObjectId())
+        product_id = _PID_STR
         mock_db.products.find_one.return_value = None
 
         # Act & Assert
-        with pytest.raises(ValueError) as exc:
+        with pytest.raises(ValueError, match=_RE_NOT_FOUND):
             inventory_service.get_product_stock(product_id)
-        assert str(exc.value) == "Product not found"
 
     def test_get_product_stock_no_inventory(self, inventory_service, mock_db):
         # Arrange
-        product_id = str(ObjectId())
-        mock_db.products.find_one.return_value = {"_id": ObjectId(product_id)}
+        product_id = _PID_STR
+        mock_db.products.find_one.return_value = _PRODUCT_DOC
         mock_db.inventory.find_one.return_value = None
 
         # Act
@@ -54,145 +80,197 @@ class TestInventoryService:
         invalid_id = "invalid-id"
 
         # Act & Assert
-        with pytest.raises(ValueError) as exc:
+        with pytest.raises(ValueError, match="Error retrieving stock"):
             inventory_service.get_product_stock(invalid_id)
-        assert "Error retrieving stock" in str(exc.value)
-
-    def test_get_all_stock_success(self, inventory_service, mock_db):
-        # Arrange
-        mock_inventory = [
-            {"productId": ObjectId(), "quantity": 100},
-            {"productId": ObjectId(), "quantity": 50}
-        ]
-        mock_db.inventory.find.return_value = mock_inventory
-
-        # Act
-        result = inventory_service.get_all_stock()
-
-        # Assert
-        assert len(result) == 2
-        assert all(isinstance(item["productId"], str) for item in result)
-        assert all(isinstance(item["quantity"], (int, float)) for item in result)
 
-    def test_get_all_stock_empty(self, inventory_service, mock_db):
+    @pytest.mark.parametrize(
+        ("mock_inventory", "expected_len"),
+        [
+            ([{"productId": _OIDS[0], "quantity": 100},
+              {"productId": _OIDS[1], "quantity": 50}], 2),
+            ([], 0),
+        ],
+        ids=["two_items", "empty"]
+    )
+    def test_get_all_stock(self, inventory_service, mock_db, mock_inventory, expected_len):
         # Arrange
-        mock_db.inventory.find.return_value = []
+        mock_db.inventory.find.return_value.skip.return_value \
+            .limit.return_value.batch_size.return_value = mock_inventory
 
         # Act
         result = inventory_service.get_all_stock()
 
         # Assert
-        assert len(result) == 0
         assert isinstance(result, list)
-
-    def test_get_all_stock_database_error(self, inventory_service, mock_db):
+        assert len(result) == expected_len
+        for item in result:
+            assert isinstance(item["productId"], str)
+            assert isinstance(item["quantity"], (int, float))
+
+    @pytest.mark.parametrize(
+        ("query", "message"),
+        [
+            (lambda service: service.get_all_stock(),
+             "Error retrieving inventory"),
+            (lambda service: service.get_low_stock_products(10),
+             "Error retrieving low stock products"),
+        ],
+        ids=["get_all_stock", "get_low_stock_products"]
+    )
+    def test_find_query_database_error(self, inventory_service, mock_db, query, message):
         # Arrange
         mock_db.inventory.find.side_effect = Exception("Database error")
 
         # Act & Assert
-        with pytest.raises(ValueError) as exc:
-            inventory_service.get_all_stock()
-        assert "Error retrieving inventory" in str(exc.value)
+        with pytest.raises(ValueError, match=message):
+            query(inventory_service)
 
-    def test_get_low_stock_products_success(self, inventory_service, mock_db):
+    def test_get_all_stock_with_product_success(self, inventory_service, mock_db):
         # Arrange
-        mock_inventory = [
-            {"productId": ObjectId(), "quantity": 5},
-            {"productId": ObjectId(), "quantity": 8}
+        mock_db.inventory.aggregate.return_value = [
+            {"productId": _OIDS[0], "quantity": 100, "name": "Steel Bar", "sku": "STL001"},
+            {"productId": _OIDS[1], "quantity": 50, "name": "Iron Rod", "sku": "IRN001"}
         ]
-        mock_db.inventory.find.return_value = mock_inventory
 
         # Act
-        result = inventory_service.get_low_stock_products(10)
+        result = inventory_service.get_all_stock_with_product()
 
         # Assert
         assert len(result) == 2
-        assert all(item["quantity"] <= 10 for item in result)
+        assert all(isinstance(item["productId"], str) for item in result)
+        assert all("name" in item and "sku" in item for item in result)
+        mock_db.inventory.aggregate.assert_called_once()
+
+    def test_get_all_stock_with_product_database_error(self, inventory_service, mock_db):
+        # Arrange
+        mock_db.inventory.aggregate.side_effect = Exception("Database error")
 
-    def test_get_low_stock_products_none_found(self, inventory_service, mock_db):
+        # Act & Assert
+        with pytest.raises(ValueError, match=_RE_RETRIEVING_INV):
+            inventory_service.get_all_stock_with_product()
+
+    @pytest.mark.parametrize(
+        ("mock_inventory", "expected_len"),
+        [
+            ([{"productId": _OIDS[2], "quantity": 5},
+              {"productId": _OIDS[3], "quantity": 8}], 2),
+            ([], 0),
+        ],
+        ids=["two_items", "none_found"]
+    )
+    def test_get_low_stock_products(self, inventory_service, mock_db, mock_inventory, expected_len):
         # Arrange
-        mock_db.inventory.find.return_value = []
+        mock_db.inventory.find.return_value.hint.return_value.skip.return_value \
+            .limit.return_value.batch_size.return_value = mock_inventory
 
         # Act
         result = inventory_service.get_low_stock_products(10)
 
         # Assert
-        assert len(result) == 0
         assert isinstance(result, list)
-
-    def test_get_low_stock_products_database_error(self, inventory_service, mock_db):
-        # Arrange
-        mock_db.inventory.find.side_effect = Exception("Database error")
-
-        # Act & Assert
-        with pytest.raises(ValueError) as exc:
-            inventory_service.get_low_stock_products(10)
-        assert "Error retrieving low stock products" in str(exc.value)
+        assert len(result) == expected_len
+        assert all(item["quantity"] <= 10 for item in result)
 
     def test_adjust_stock_success(self, inventory_service, mock_db):
         # Arrange
-        product_id = str(ObjectId())
-        mock_db.products.find_one.return_value = {"_id": ObjectId(product_id)}
-        mock_db.inventory.update_one.return_value.modified_count = 1
+        product_id = _PID_STR
+        mock_db.products.find_one.return_value = _PRODUCT_DOC
+        mock_db.inventory.find_one.return_value = {
+            "productId": _PID, "quantity": 50, "version": 1
+        }
+        mock_db.inventory.find_one_and_update.return_value = _STOCK_100
 
         # Act
         result = inventory_service.adjust_stock(product_id, 100)
 
         # Assert
         assert result["message"] == "Stock adjusted successfully"
-        mock_db.inventory.update_one.assert_called_once()
+        assert result["productId"] == product_id
+        assert result["quantity"] == 100
+        mock_db.inventory.find_one_and_update.assert_called_once()
 
     def test_adjust_stock_product_not_found(self, inventory_service, mock_db):
         # Arrange
-        product_id = str(ObjectId())
+        product_id = _PID_STR
         mock_db.products.find_one.return_value = None
 
         # Act & Assert
-        with pytest.raises(ValueError) as exc:
+        with pytest.raises(ValueError, match=_RE_NOT_FOUND):
             inventory_service.adjust_stock(product_id, 100)
-        assert str(exc.value) == "Product not found"
 
     def test_adjust_stock_negative_quantity(self, inventory_service, mock_db):
         # Arrange
-        product_id = str(ObjectId())
-        mock_db.products.find_one.return_value = {"_id": ObjectId(product_id)}
+        product_id = _PID_STR
+        mock_db.products.find_one.return_value = _PRODUCT_DOC
 
         # Act & Assert
-        with pytest.raises(ValueError) as exc:
+        with pytest.raises(ValueError, match=_RE_POSITIVE_QTY):
             inventory_service.adjust_stock(product_id, -10)
-        assert str(exc.value) == "Quantity must be a positive number"
 
-    def test_adjust_stock_invalid_quantity_type(self, inventory_service, mock_db):
+    @pytest.mark.parametrize(
+        "invalid_quantity",
+        ["10", "abc", None, [], {}],
+        ids=["str_num", "str_alpha", "none", "list", "dict"]
+    )
+    def test_adjust_stock_invalid_quantity_type(self, inventory_service, mock_db, invalid_quantity):
         # Arrange
-        product_id = str(ObjectId())
-        mock_db.products.find_one.return_value = {"_id": ObjectId(product_id)}
-        invalid_quantities = ["10", "abc", None, [], {}]
+        product_id = _PID_STR
+        mock_db.products.find_one.return_value = _PRODUCT_DOC
 
         # Act & Assert
-        for invalid_quantity in invalid_quantities:
-            with pytest.raises(ValueError) as exc:
-                inventory_service.adjust_stock(product_id, invalid_quantity)
-            assert str(exc.value) == "Quantity must be a positive number"
+        with pytest.raises(ValueError, match=_RE_POSITIVE_QTY):
+            inventory_service.adjust_stock(product_id, invalid_quantity)
+
+    def test_adjust_stock_unversioned_document(self, inventory_service, mock_db):
+        # Arrange: inventory doc created before versioning (no version field)
+        product_id = _PID_STR
+        mock_db.products.find_one.return_value = _PRODUCT_DOC
+        mock_db.inventory.find_one.return_value = {"productId": _PID, "quantity": 50}
+        mock_db.inventory.find_one_and_update.return_value = _STOCK_100
+
+        # Act
+        result = inventory_service.adjust_stock(product_id, 100)
+
+        # Assert: matched on the field's absence, not version == 0
+        assert result["message"] == "Stock adjusted successfully"
+        filter_query, update = mock_db.inventory.find_one_and_update.call_args[0]
+        assert filter_query["version"] == {"$exists": False}
+        assert update["$set"]["version"] == 1
+
+    def test_adjust_stock_version_conflict(self, inventory_service, mock_db):
+        # Arrange
+        product_id = _PID_STR
+        mock_db.products.find_one.return_value = _PRODUCT_DOC
+        mock_db.inventory.find_one.return_value = {"version": 2}
+        mock_db.inventory.find_one_and_update.return_value = None
+
+        # Act & Assert
+        with pytest.raises(ValueError, match="conflicted"):
+            inventory_service.adjust_stock(product_id, 100, max_retries=1)
 
     def test_adjust_stock_database_error(self, inventory_service, mock_db):
         # Arrange
-        product_id = str(ObjectId())
-        mock_db.products.find_one.return_value = {"_id": ObjectId(product_id)}
-        mock_db.inventory.update_one.side_effect = Exception("Database error")
+        product_id = _PID_STR
+        mock_db.products.find_one.return_value = _PRODUCT_DOC
+        mock_db.inventory.find_one.return_value = {
+            "productId": _PID, "quantity": 50, "version": 1
+        }
+        mock_db.inventory.find_one_and_update.side_effect = Exception("Database error")
 
         # Act & Assert
-        with pytest.raises(ValueError) as exc:
+        with pytest.raises(ValueError, match="Error adjusting stock"):
             inventory_service.adjust_stock(product_id, 100)
-        assert "Error adjusting stock" in str(exc.value)
 
     def test_adjust_multiple_stocks_success(self, inventory_service, mock_db):
         # Arrange
         adjustments = [
-            (str(ObjectId()), 100),
-            (str(ObjectId()), 200)
+            (_OID_STRS[0], 100),
+            (_OID_STRS[1], 200)
+        ]
+        mock_db.products.find.return_value = [
+            {"_id": ObjectId(product_id)} for product_id, _ in adjustments
         ]
-        mock_db.products.find_one.return_value = {"_id": ObjectId()}
-        
+
         bulk_write_result = MagicMock()
         bulk_write_result.modified_count = 1
         bulk_write_result.upserted_count = 1
@@ -210,37 +288,34 @@ class TestInventoryService:
     def test_adjust_multiple_stocks_product_not_found(self, inventory_service, mock_db):
         # Arrange
         adjustments = [
-            (str(ObjectId()), 100),
-            (str(ObjectId()), 200)
+            (_OID_STRS[0], 100),
+            (_OID_STRS[1], 200)
         ]
-        mock_db.products.find_one.return_value = None
+        mock_db.products.find.return_value = []
 
         # Act & Assert
-        with pytest.raises(ValueError) as exc:
+        with pytest.raises(ValueError, match=r"Product .* not found"):
             inventory_service.adjust_multiple_stocks(adjustments)
-        assert "Product" in str(exc.value)
-        assert "not found" in str(exc.value)
 
     def test_adjust_multiple_stocks_invalid_quantity(self, inventory_service, mock_db):
         # Arrange
-        product_id = str(ObjectId())
+        product_id = _PID_STR
         adjustments = [
             (product_id, 100),
             (product_id, -50)  # Invalid quantity
         ]
-        mock_db.products.find_one.return_value = {"_id": ObjectId()}
+        mock_db.products.find.return_value = [{"_id": _PID}]
 
         # Act & Assert
-        with pytest.raises(ValueError) as exc:
+        with pytest.raises(ValueError, match="Invalid quantity for product"):
             inventory_service.adjust_multiple_stocks(adjustments)
-        assert "Invalid quantity for product" in str(exc.value)
 
     def test_validate_stock_level_normal(self, inventory_service, mock_db):
         # Arrange
-        product_id = str(ObjectId())
-        mock_db.products.find_one.return_value = {"_id": ObjectId(product_id)}
+        product_id = _PID_STR
+        mock_db.products.find_one.return_value = _PRODUCT_DOC
         mock_db.inventory.find_one.return_value = {
-            "productId": ObjectId(product_id),
+            "productId": _PID,
             "quantity": 500
         }
 
@@ -255,10 +330,10 @@ class TestInventoryService:
 
     def test_validate_stock_level_low(self, inventory_service, mock_db):
         # Arrange
-        product_id = str(ObjectId())
-        mock_db.products.find_one.return_value = {"_id": ObjectId(product_id)}
+        product_id = _PID_STR
+        mock_db.products.find_one.return_value = _PRODUCT_DOC
         mock_db.inventory.find_one.return_value = {
-            "productId": ObjectId(product_id),
+            "productId": _PID,
             "quantity": 5
         }
 
@@ -271,10 +346,10 @@ class TestInventoryService:
 
     def test_validate_stock_level_excess(self, inventory_service, mock_db):
         # Arrange
-        product_id = str(ObjectId())
-        mock_db.products.find_one.return_value = {"_id": ObjectId(product_id)}
+        product_id = _PID_STR
+        mock_db.products.find_one.return_value = _PRODUCT_DOC
         mock_db.inventory.find_one.return_value = {
-            "productId": ObjectId(product_id),
+            "productId": _PID,
             "quantity": 1500
         }
 
@@ -1,4 +1,6 @@
 # tests/unit/test_movement_service.py
+import re
+
 import pytest
 from bson import ObjectId
 from datetime import datetime
@@ -6,26 +8,53 @@ from unittest.mock import Mock
 
 from services.movement_service import MovementService
 
+# Shared ids built once at import, mirroring test_inventory_service:
+# most tests only need "some valid id", so generating fresh ObjectIds
+# per test bought nothing
+_PID = ObjectId()
+_PID_STR = str(_PID)
+_OIDS = tuple(ObjectId() for _ in range(4))
+_OID_STRS = tuple(str(oid) for oid in _OIDS)
+
+# Tests only need "a datetime", not the current one; one frozen value
+# replaces a clock read per construction site
+_NOW = datetime(2024, 1, 1)
+
+# Messages asserted by more than one test, following the pattern in
+# test_inventory_service; the invalid-type message stays a plain string
+# because the parametrize table escapes messages at the use site
+_INVALID_TYPE_MSG = "Invalid movement type. Must be 'IN' or 'OUT'"
+_RE_CREATING_MOV = re.compile("Error creating movement")
+_RE_RETRIEVING_MOV = re.compile("Error retrieving movements")
+
 class TestMovementService:
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def movement_service(self, mock_db):
         return MovementService(mock_db)
 
-    @pytest.fixture
-    def sample_movement_data(self):
+    @pytest.fixture(scope="module")
+    def _movement_template(self):
+        # Built once per module; the ObjectId and timestamp only exist
+        # to be valid, so there is no need to regenerate them per test
         return {
-            "productId": str(ObjectId()),
+            "productId": _PID_STR,
             "type": "IN",
             "quantity": 100,
             "unitPrice": 29.99,
-            "date": datetime.utcnow(),
+            "date": _NOW,
             "reference": "PO-001",
             "notes": "Initial stock"
         }
 
+    @pytest.fixture
+    def sample_movement_data(self, _movement_template):
+        # Shallow copy per test: create_movement mutates its argument
+        # (productId is rewritten to an ObjectId in place)
+        return _movement_template.copy()
+
     def test_create_movement_success(self, movement_service, mock_db, sample_movement_data):
         # Arrange
-        mock_db.products.find_one.return_value = {"_id": ObjectId(sample_movement_data["productId"])}
+        mock_db.products.find_one.return_value = {"_id": _PID}
         mock_db.movements.insert_one.return_value.inserted_id = ObjectId()
         mock_db.inventory.find_one.return_value = None
         mock_db.inventory.update_one.return_value.modified_count = 1
@@ -44,9 +73,8 @@ class TestMovementService:
         mock_db.products.find_one.return_value = None
 
         # Act & Assert
-        with pytest.raises(ValueError) as exc:
+        with pytest.raises(ValueError, match="Product not found"):
             movement_service.create_movement(sample_movement_data)
-        assert str(exc.value) == "Product not found"
 
     def test_create_movement_invalid_product_id_format(self, movement_service, mock_db):
         # Arrange
@@ -54,66 +82,147 @@ class TestMovementService:
             "productId": "invalid-id",
             "type": "IN",
             "quantity": 100,
-            "date": datetime.utcnow()
+            "date": _NOW
         }
 
         # Act & Assert
-        with pytest.raises(ValueError) as exc:
+        with pytest.raises(ValueError, match="Invalid product ID format"):
             movement_service.create_movement(invalid_data)
-        assert str(exc.value) == "Invalid product ID format"
 
-    def test_create_movement_invalid_type(self, movement_service, sample_movement_data):
+    @pytest.mark.parametrize(
+        ("mutate", "message"),
+        [
+            (lambda d: d.update(type="INVALID"),
+             _INVALID_TYPE_MSG),
+            (lambda d: d.update(quantity=-10), "Quantity must be positive"),
+            (lambda d: d.update(quantity=0), "Quantity must be positive"),
+            (lambda d: d.pop("productId"), "productId is required"),
+        ],
+        ids=["invalid_type", "negative_quantity", "zero_quantity",
+             "missing_product_id"]
+    )
+    def test_create_movement_invalid_data(self, movement_service, sample_movement_data, mutate, message):
         # Arrange
-        invalid_data = sample_movement_data.copy()
-        invalid_data["type"] = "INVALID"
+        mutate(sample_movement_data)
 
         # Act & Assert
-        with pytest.raises(ValueError) as exc:
-            movement_service.create_movement(invalid_data)
-        assert str(exc.value) == "Invalid movement type. Must be 'IN' or 'OUT'"
+        with pytest.raises(ValueError, match=re.escape(message)):
+            movement_service.create_movement(sample_movement_data)
 
-    def test_create_movement_negative_quantity(self, movement_service, sample_movement_data):
+    def test_create_movement_out_success(self, movement_service, mock_db, sample_movement_data):
         # Arrange
-        invalid_data = sample_movement_data.copy()
-        invalid_data["quantity"] = -10
+        out_movement = sample_movement_data.copy()
+        out_movement["type"] = "OUT"
+        mock_db.products.find_one.return_value = {"_id": _PID}
+        mock_db.inventory.find_one_and_update.return_value = {"quantity": 200}
+        mock_db.movements.insert_one.return_value.inserted_id = ObjectId()
 
-        # Act & Assert
-        with pytest.raises(ValueError) as exc:
-            movement_service.create_movement(invalid_data)
-        assert str(exc.value) == "Quantity must be positive"
+        # Act
+        result = movement_service.create_movement(out_movement)
+
+        # Assert
+        assert result["message"] == "Movement created successfully"
+        mock_db.inventory.find_one_and_update.assert_called_once()
+        mock_db.movements.insert_one.assert_called_once()
 
     def test_create_movement_insufficient_stock(self, movement_service, mock_db, sample_movement_data):
         # Arrange
         out_movement = sample_movement_data.copy()
         out_movement["type"] = "OUT"
-        mock_db.products.find_one.return_value = {"_id": ObjectId(out_movement["productId"])}
-        mock_db.inventory.find_one.return_value = {"quantity": 50}  # Less than requested quantity
+        mock_db.products.find_one.return_value = {"_id": _PID}
+        mock_db.inventory.find_one_and_update.return_value = None  # Not enough stock
 
         # Act & Assert
-        with pytest.raises(ValueError) as exc:
+        with pytest.raises(ValueError, match="Insufficient stock"):
             movement_service.create_movement(out_movement)
-        assert str(exc.value) == "Insufficient stock"
 
     def test_create_movement_database_error(self, movement_service, mock_db, sample_movement_data):
         # Arrange
-        mock_db.products.find_one.return_value = {"_id": ObjectId(sample_movement_data["productId"])}
+        mock_db.products.find_one.return_value = {"_id": _PID}
         mock_db.movements.insert_one.side_effect = Exception("Database error")
 
         # Act & Assert
-        with pytest.raises(ValueError) as exc:
+        with pytest.raises(ValueError, match=_RE_CREATING_MOV):
             movement_service.create_movement(sample_movement_data)
-        assert "Error creating movement" in str(exc.value)
+
+    def test_create_movements_success(self, movement_service, mock_db):
+        # Arrange
+        movements = [
+            {"productId": _OID_STRS[0], "type": "IN", "quantity": 100},
+            {"productId": _OID_STRS[1], "type": "OUT", "quantity": 30}
+        ]
+        mock_db.products.find.return_value = [
+            {"_id": ObjectId(m["productId"])} for m in movements
+        ]
+        mock_db.movements.insert_many.return_value.inserted_ids = [_OIDS[2], _OIDS[3]]
+        mock_db.inventory.bulk_write.return_value.modified_count = 2
+
+        # Act
+        result = movement_service.create_movements(movements)
+
+        # Assert
+        assert result["message"] == "Movements created successfully"
+        assert result["inserted_count"] == 2
+        assert result["modified_count"] == 2
+        mock_db.movements.insert_many.assert_called_once()
+        mock_db.inventory.bulk_write.assert_called_once()
+
+    def test_create_movements_soft_durability(self, movement_service, mock_db):
+        # Arrange
+        movements = [
+            {"productId": _OID_STRS[0], "type": "IN", "quantity": 100}
+        ]
+        mock_db.products.find.return_value = [
+            {"_id": _OIDS[0]}
+        ]
+        unacknowledged = mock_db.movements.with_options.return_value
+        unacknowledged.insert_many.return_value.inserted_ids = [_OIDS[1]]
+        mock_db.inventory.bulk_write.return_value.modified_count = 1
+
+        # Act
+        result = movement_service.create_movements(movements, durability="soft")
+
+        # Assert
+        assert result["message"] == "Movements created successfully"
+        mock_db.movements.with_options.assert_called_once()
+        unacknowledged.insert_many.assert_called_once()
+
+    def test_create_movements_empty_batch(self, movement_service):
+        # Act & Assert
+        with pytest.raises(ValueError, match="No movements provided"):
+            movement_service.create_movements([])
+
+    def test_create_movements_product_not_found(self, movement_service, mock_db):
+        # Arrange
+        movements = [
+            {"productId": _PID_STR, "type": "IN", "quantity": 100}
+        ]
+        mock_db.products.find.return_value = []
+
+        # Act & Assert
+        with pytest.raises(ValueError, match="not found"):
+            movement_service.create_movements(movements)
+
+    def test_create_movements_invalid_type(self, movement_service):
+        # Arrange
+        movements = [
+            {"productId": _PID_STR, "type": "INVALID", "quantity": 100}
+        ]
+
+        # Act & Assert
+        with pytest.raises(ValueError, match=re.escape(_INVALID_TYPE_MSG)):
+            movement_service.create_movements(movements)
 
     def test_get_movement_by_id_success(self, movement_service, mock_db):
         # Arrange
-        movement_id = ObjectId()
-        product_id = ObjectId()
+        movement_id = _OIDS[0]
+        product_id = _PID
         mock_movement = {
             "_id": movement_id,
             "productId": product_id,
             "type": "IN",
             "quantity": 100,
-            "date": datetime.utcnow()
+            "date": _NOW
         }
         mock_db.movements.find_one.return_value = mock_movement
 
@@ -127,207 +236,114 @@ class TestMovementService:
 
     def test_get_movement_by_id_not_found(self, movement_service, mock_db):
         # Arrange
-        movement_id = str(ObjectId())
+        movement_id = _PID_STR
         mock_db.movements.find_one.return_value = None
 
         # Act & Assert
-        with pytest.raises(ValueError) as exc:
+        with pytest.raises(ValueError, match="Movement not found"):
             movement_service.get_movement_by_id(movement_id)
-        assert str(exc.value) == "Movement not found"
-
-    def test_get_movement_by_id_invalid_id(self, movement_service):
-        # Arrange
-        invalid_id = "invalid-id"
 
+    @pytest.mark.parametrize(
+        ("op", "message"),
+        [
+            (lambda service: service.get_movement_by_id("invalid-id"),
+             "Invalid movement ID format"),
+            (lambda service: service.get_movements_by_product("invalid-id"),
+             "Invalid product ID format"),
+        ],
+        ids=["movement_id", "product_id"]
+    )
+    def test_invalid_id_format(self, movement_service, op, message):
         # Act & Assert
-        with pytest.raises(ValueError) as exc:
-            movement_service.get_movement_by_id(invalid_id)
-        assert "Invalid movement ID format" in str(exc.value)
-
-    def test_get_movements_by_product_success(self, movement_service, mock_db):
-        # Arrange
-        product_id = str(ObjectId())
-        mock_movements = [
-            {
-                "_id": ObjectId(),
-                "productId": ObjectId(product_id),
-                "type": "IN",
-                "quantity": 100,
-                "date": datetime.utcnow()
-            },
-            {
-                "_id": ObjectId(),
-                "productId": ObjectId(product_id),
-                "type": "OUT",
-                "quantity": 30,
-                "date": datetime.utcnow()
-            }
+        with pytest.raises(ValueError, match=message):
+            op(movement_service)
+
+    _QUERIES = [
+        ("by_product",
+         lambda service: service.get_movements_by_product(_PID_STR)),
+        ("by_date_range",
+         lambda service: service.get_movements_by_date_range(
+             datetime(2024, 1, 1), datetime(2024, 1, 31))),
+        ("by_type", lambda service: service.get_movements_by_type("IN")),
+    ]
+
+    @pytest.mark.parametrize(
+        "query", [q for _, q in _QUERIES], ids=[i for i, _ in _QUERIES]
+    )
+    def test_get_movements_formatted(self, movement_service, mock_db, query):
+        # Arrange: rows as the aggregation's $addFields/$unset stages
+        # would emit them - already formatted, ids stringified
+        mock_db.movements.aggregate.return_value = [
+            {"id": _OID_STRS[0], "productId": _PID_STR, "type": "IN",
+             "quantity": 100, "date": _NOW},
+            {"id": _OID_STRS[1], "productId": _PID_STR, "type": "OUT",
+             "quantity": 30, "date": _NOW}
         ]
-        mock_db.movements.find.return_value = mock_movements
 
         # Act
-        result = movement_service.get_movements_by_product(product_id)
+        result = query(movement_service)
 
         # Assert
         assert len(result) == 2
-        assert all("id" in movement for movement in result)
-        assert all("_id" not in movement for movement in result)
-        assert all(isinstance(movement["productId"], str) for movement in result)
-
-    def test_get_movements_by_product_invalid_id(self, movement_service):
-        # Arrange
-        invalid_id = "invalid-id"
-
-        # Act & Assert
-        with pytest.raises(ValueError) as exc:
-            movement_service.get_movements_by_product(invalid_id)
-        assert "Invalid product ID format" in str(exc.value)
-
-    def test_get_movements_by_product_no_movements(self, movement_service, mock_db):
-        # Arrange
-        product_id = str(ObjectId())
-        mock_db.movements.find.return_value = []
-
-        # Act
-        result = movement_service.get_movements_by_product(product_id)
-
-        # Assert
-        assert len(result) == 0
-        assert isinstance(result, list)
-
-    def test_get_movements_by_date_range(self, movement_service, mock_db):
+        for movement in result:
+            assert "id" in movement
+            assert "_id" not in movement
+            assert isinstance(movement["productId"], str)
+
+    @pytest.mark.parametrize(
+        "query", [q for _, q in _QUERIES], ids=[i for i, _ in _QUERIES]
+    )
+    def test_get_movements_empty(self, movement_service, mock_db, query):
         # Arrange
-        start_date = datetime(2024, 1, 1)
-        end_date = datetime(2024, 1, 31)
-        product_id = ObjectId()
-        mock_movements = [
-            {
-                "_id": ObjectId(),
-                "productId": product_id,
-                "date": datetime(2024, 1, 15),
-                "type": "IN",
-                "quantity": 100
-            },
-            {
-                "_id": ObjectId(),
-                "productId": product_id,
-                "date": datetime(2024, 1, 20),
-                "type": "OUT",
-                "quantity": 50
-            }
-        ]
-        mock_db.movements.find.return_value = mock_movements
+        mock_db.movements.aggregate.return_value = []
 
         # Act
-        result = movement_service.get_movements_by_date_range(start_date, end_date)
+        result = query(movement_service)
 
         # Assert
-        assert len(result) == 2
-        assert all("id" in movement for movement in result)
-        assert all("_id" not in movement for movement in result)
-        assert all(isinstance(movement["productId"], str) for movement in result)
+        assert result == []
 
     def test_get_movements_by_date_range_invalid_dates(self, movement_service, mock_db):
         # Arrange
-        mock_db.movements.find.side_effect = Exception("Invalid date format")
+        mock_db.movements.aggregate.side_effect = Exception("Invalid date format")
 
         # Act & Assert
-        with pytest.raises(ValueError) as exc:
+        with pytest.raises(ValueError, match=_RE_RETRIEVING_MOV):
             movement_service.get_movements_by_date_range("invalid-date", "invalid-date")
-        assert "Error retrieving movements" in str(exc.value)
-
-    def test_get_movements_by_date_range_no_movements(self, movement_service, mock_db):
-        # Arrange
-        start_date = datetime(2024, 1, 1)
-        end_date = datetime(2024, 1, 31)
-        mock_db.movements.find.return_value = []
-
-        # Act
-        result = movement_service.get_movements_by_date_range(start_date, end_date)
-
-        # Assert
-        assert len(result) == 0
-        assert isinstance(result, list)
-
-    def test_get_movements_by_type(self, movement_service, mock_db):
-        # Arrange
-        movement_type = "IN"
-        product_id = ObjectId()
-        mock_movements = [
-            {
-                "_id": ObjectId(),
-                "productId": product_id,
-                "type": "IN",
-                "quantity": 100,
-                "date": datetime.utcnow()
-            },
-            {
-                "_id": ObjectId(),
-                "productId": product_id,
-                "type": "IN",
-                "quantity": 50,
-                "date": datetime.utcnow()
-            }
-        ]
-        mock_db.movements.find.return_value = mock_movements
-
-        # Act
-        result = movement_service.get_movements_by_type(movement_type)
-
-        # Assert
-        assert len(result) == 2
-        assert all(movement["type"] == "IN" for movement in result)
-        assert all("id" in movement for movement in result)
-        assert all("_id" not in movement for movement in result)
-        assert all(isinstance(movement["productId"], str) for movement in result)
 
     def test_get_movements_by_type_invalid_type(self, movement_service):
         # Arrange
         invalid_type = "INVALID"
 
         # Act & Assert
-        with pytest.raises(ValueError) as exc:
+        with pytest.raises(ValueError, match=re.escape(_INVALID_TYPE_MSG)):
             movement_service.get_movements_by_type(invalid_type)
-        assert str(exc.value) == "Invalid movement type. Must be 'IN' or 'OUT'"
-
-    def test_get_movements_by_type_no_movements(self, movement_service, mock_db):
-        # Arrange
-        mock_db.movements.find.return_value = []
-
-        # Act
-        result = movement_service.get_movements_by_type("IN")
-
-        # Assert
-        assert len(result) == 0
-        assert isinstance(result, list)
 
     def test_get_movements_by_type_database_error(self, movement_service, mock_db):
         # Arrange
-        mock_db.movements.find.side_effect = Exception("Database error")
+        mock_db.movements.aggregate.side_effect = Exception("Database error")
 
         # Act & Assert
-        with pytest.raises(ValueError) as exc:
+        with pytest.raises(ValueError, match=_RE_RETRIEVING_MOV):
             movement_service.get_movements_by_type("IN")
-        assert "Error retrieving movements" in str(exc.value)
 
     def test_format_movement_missing_id(self, movement_service):
         # Arrange
         movement = {
-            "productId": ObjectId(),
+            "productId": _PID,
             "type": "IN",
             "quantity": 100
         }
 
         # Act & Assert
-        with pytest.raises(ValueError) as exc:
+        with pytest.raises(ValueError, match="Error formatting movement"):
             movement_service._format_movement(movement)
-        assert "Error formatting movement" in str(exc.value)
 
     def test_format_movement_with_existing_id(self, movement_service):
         # Arrange
         movement = {
-            "id": str(ObjectId()),
-            "productId": ObjectId(),
+            "id": _OID_STRS[0],
+            "productId": _PID,
             "type": "IN",
             "quantity": 100
         }
@@ -340,35 +356,12 @@ class TestMovementService:
         assert "_id" not in result
         assert isinstance(result["productId"], str)
 
-    def test_create_movement_missing_required_fields(self, movement_service):
-        # Arrange
-        invalid_data = {
-            "type": "IN",
-            "quantity": 100
-        }
-
-        # Act & Assert
-        with pytest.raises(ValueError) as exc:
-            movement_service.create_movement(invalid_data)
-        assert "productId is required" in str(exc.value)
-
-    def test_create_movement_zero_quantity(self, movement_service, sample_movement_data):
-        # Arrange
-        invalid_data = sample_movement_data.copy()
-        invalid_data["quantity"] = 0
-
-        # Act & Assert
-        with pytest.raises(ValueError) as exc:
-            movement_service.create_movement(invalid_data)
-        assert str(exc.value) == "Quantity must be positive"
-
     def test_create_movement_inventory_update_error(self, movement_service, mock_db, sample_movement_data):
         # Arrange
-        mock_db.products.find_one.return_value = {"_id": ObjectId(sample_movement_data["productId"])}
+        mock_db.products.find_one.return_value = {"_id": _PID}
         mock_db.movements.insert_one.return_value.inserted_id = ObjectId()
         mock_db.inventory.update_one.side_effect = Exception("Database error")
 
         # Act & Assert
-        with pytest.raises(ValueError) as exc:
+        with pytest.raises(ValueError, match=_RE_CREATING_MOV):
             movement_service.create_movement(sample_movement_data)
-        assert "Error creating movement" in str(exc.value)
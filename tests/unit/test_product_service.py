@@ -1,16 +1,40 @@
+import re
+
 import pytest
 from bson import ObjectId
 from unittest.mock import Mock
 
 from services.product_service import ProductService
 
+# Shared ids built once at import, mirroring the other service suites
+_PID = ObjectId()
+_PID_STR = str(_PID)
+_OIDS = tuple(ObjectId() for _ in range(2))
+
+# Compiled once: the one message asserted by several tests here
+_RE_SKU_EXISTS = re.compile("SKU already exists")
+
+class _Cursor(list):
+    """Stands in for a pymongo cursor: chained methods return self."""
+
+    def skip(self, _):
+        return self
+
+    def limit(self, _):
+        return self
+
+    def batch_size(self, _):
+        return self
+
+
 class TestProductService:
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def product_service(self, mock_db):
         return ProductService(mock_db)
 
-    @pytest.fixture
-    def sample_product_data(self):
+    @pytest.fixture(scope="module")
+    def _product_template(self):
+        # Built once per module; tests copy before mutating
         return {
             "name": "Steel Bar",
             "description": "High-quality steel bar",
@@ -19,10 +43,14 @@ class TestProductService:
             "sku": "STL001"
         }
 
+    @pytest.fixture
+    def sample_product_data(self, _product_template):
+        return _product_template.copy()
+
     def test_create_product_success(self, product_service, mock_db, sample_product_data):
         # Arrange
         mock_db.products.find_one.return_value = None
-        mock_db.products.insert_one.return_value.inserted_id = ObjectId()
+        mock_db.products.insert_one.return_value.inserted_id = _OIDS[0]
 
         # Act
         result = product_service.create_product(sample_product_data)
@@ -34,12 +62,11 @@ class TestProductService:
 
     def test_create_product_duplicate_sku(self, product_service, mock_db, sample_product_data):
         # Arrange
-        mock_db.products.find_one.return_value = {"_id": ObjectId()}
+        mock_db.products.find_one.return_value = {"_id": _OIDS[0]}
 
         # Act & Assert
-        with pytest.raises(ValueError) as exc:
+        with pytest.raises(ValueError, match=_RE_SKU_EXISTS):
             product_service.create_product(sample_product_data)
-        assert str(exc.value) == "SKU already exists"
 
     def test_create_product_missing_field(self, product_service):
         # Arrange
@@ -50,13 +77,51 @@ class TestProductService:
         }
 
         # Act & Assert
-        with pytest.raises(ValueError) as exc:
+        with pytest.raises(ValueError, match="Missing required field:"):
             product_service.create_product(incomplete_data)
-        assert "Missing required field:" in str(exc.value)
+
+    def test_create_products_success(self, product_service, mock_db, sample_product_data):
+        # Arrange
+        batch = [
+            sample_product_data,
+            {**sample_product_data, "sku": "STL002"}
+        ]
+        mock_db.products.find.return_value = []
+        mock_db.products.insert_many.return_value.inserted_ids = [_OIDS[0], _OIDS[1]]
+
+        # Act
+        result = product_service.create_products(batch)
+
+        # Assert
+        assert result["message"] == "Products created successfully"
+        assert len(result["ids"]) == 2
+        mock_db.products.insert_many.assert_called_once_with(batch, ordered=False)
+
+    def test_create_products_existing_sku(self, product_service, mock_db, sample_product_data):
+        # Arrange
+        batch = [sample_product_data]
+        mock_db.products.find.return_value = [{"sku": sample_product_data["sku"]}]
+
+        # Act & Assert
+        with pytest.raises(ValueError, match=_RE_SKU_EXISTS):
+            product_service.create_products(batch)
+
+    def test_create_products_duplicate_sku_in_batch(self, product_service, sample_product_data):
+        # Arrange
+        batch = [sample_product_data, sample_product_data.copy()]
+
+        # Act & Assert
+        with pytest.raises(ValueError, match="Duplicate SKU in batch"):
+            product_service.create_products(batch)
+
+    def test_create_products_empty_batch(self, product_service):
+        # Act & Assert
+        with pytest.raises(ValueError, match="No products provided"):
+            product_service.create_products([])
 
     def test_get_product_by_id_success(self, product_service, mock_db):
         # Arrange
-        product_id = ObjectId()
+        product_id = _PID
         mock_product = {
             "_id": product_id,
             "name": "Steel Bar",
@@ -75,30 +140,41 @@ class TestProductService:
         assert "name" in result
         assert "_id" not in result
 
-    def test_get_product_by_id_not_found(self, product_service, mock_db):
+    @pytest.mark.parametrize(
+        "op",
+        [
+            lambda service, pid: service.get_product_by_id(pid),
+            lambda service, pid: service.update_product(pid, {"name": "New Name"}),
+        ],
+        ids=["get", "update"]
+    )
+    def test_product_not_found(self, product_service, mock_db, op):
         # Arrange
-        product_id = str(ObjectId())
         mock_db.products.find_one.return_value = None
 
         # Act & Assert
-        with pytest.raises(ValueError) as exc:
-            product_service.get_product_by_id(product_id)
-        assert str(exc.value) == "Product not found"
-
-    def test_get_product_by_id_invalid_object_id(self, product_service):
-        # Arrange
-        invalid_id = "invalid-object-id"
-
+        with pytest.raises(ValueError, match="Product not found"):
+            op(product_service, _PID_STR)
+
+    @pytest.mark.parametrize(
+        "op",
+        [
+            lambda service, pid: service.get_product_by_id(pid),
+            lambda service, pid: service.update_product(pid, {"name": "New Name"}),
+            lambda service, pid: service.delete_product(pid),
+        ],
+        ids=["get", "update", "delete"]
+    )
+    def test_invalid_object_id(self, product_service, op):
         # Act & Assert
-        with pytest.raises(ValueError) as exc:
-            product_service.get_product_by_id(invalid_id)
-        assert "Invalid product ID" in str(exc.value)
+        with pytest.raises(ValueError, match="Invalid product ID"):
+            op(product_service, "invalid-object-id")
 
     def test_update_product_success(self, product_service, mock_db):
         # Arrange
-        product_id = str(ObjectId())
+        product_id = _PID_STR
         update_data = {"name": "Updated Steel Bar"}
-        mock_db.products.find_one.return_value = {"_id": ObjectId(product_id)}
+        mock_db.products.find_one.return_value = {"_id": _PID}
         mock_db.products.update_one.return_value.modified_count = 1
 
         # Act
@@ -108,32 +184,11 @@ class TestProductService:
         assert result["message"] == "Product updated successfully"
         mock_db.products.update_one.assert_called_once()
 
-    def test_update_product_not_found(self, product_service, mock_db):
-        # Arrange
-        product_id = str(ObjectId())
-        update_data = {"name": "New Name"}
-        mock_db.products.find_one.return_value = None
-
-        # Act & Assert
-        with pytest.raises(ValueError) as exc:
-            product_service.update_product(product_id, update_data)
-        assert str(exc.value) == "Product not found"
-
-    def test_update_product_invalid_object_id(self, product_service):
-        # Arrange
-        invalid_id = "invalid-object-id"
-        update_data = {"name": "New Name"}
-
-        # Act & Assert
-        with pytest.raises(ValueError) as exc:
-            product_service.update_product(invalid_id, update_data)
-        assert "Invalid product ID" in str(exc.value)
-
     def test_update_product_no_changes(self, product_service, mock_db):
         # Arrange
-        product_id = str(ObjectId())
+        product_id = _PID_STR
         update_data = {"name": "New Name"}
-        mock_db.products.find_one.return_value = {"_id": ObjectId(product_id)}
+        mock_db.products.find_one.return_value = {"_id": _PID}
         mock_db.products.update_one.return_value.modified_count = 0
 
         # Act
@@ -144,22 +199,21 @@ class TestProductService:
 
     def test_update_product_duplicate_sku(self, product_service, mock_db):
         # Arrange
-        product_id = str(ObjectId())
+        product_id = _PID_STR
         update_data = {"sku": "EXISTING-SKU"}
         mock_db.products.find_one.side_effect = [
-            {"_id": ObjectId(product_id)},  # First call: product exists
-            {"_id": ObjectId()}  # Second call: existing SKU found
+            {"_id": _PID},  # First call: product exists
+            {"_id": _OIDS[0]}  # Second call: existing SKU found
         ]
 
         # Act & Assert
-        with pytest.raises(ValueError) as exc:
+        with pytest.raises(ValueError, match=_RE_SKU_EXISTS):
             product_service.update_product(product_id, update_data)
-        assert str(exc.value) == "SKU already exists"
 
     def test_delete_product_success(self, product_service, mock_db):
         # Arrange
-        product_id = str(ObjectId())
-        mock_db.products.find_one.return_value = {"_id": ObjectId(product_id)}
+        product_id = _PID_STR
+        mock_db.products.find_one.return_value = {"_id": _PID}
         mock_db.inventory.find_one.return_value = None
         mock_db.products.delete_one.return_value.deleted_count = 1
 
@@ -172,28 +226,18 @@ class TestProductService:
 
     def test_delete_product_in_inventory(self, product_service, mock_db):
         # Arrange
-        product_id = str(ObjectId())
-        mock_db.products.find_one.return_value = {"_id": ObjectId(product_id)}
-        mock_db.inventory.find_one.return_value = {"_id": ObjectId()}
+        product_id = _PID_STR
+        mock_db.products.find_one.return_value = {"_id": _PID}
+        mock_db.inventory.find_one.return_value = {"_id": _OIDS[0]}
 
         # Act & Assert
-        with pytest.raises(ValueError) as exc:
+        with pytest.raises(ValueError, match="Cannot delete product that exists in inventory"):
             product_service.delete_product(product_id)
-        assert str(exc.value) == "Cannot delete product that exists in inventory"
-
-    def test_delete_product_invalid_object_id(self, product_service):
-        # Arrange
-        invalid_id = "invalid-object-id"
-
-        # Act & Assert
-        with pytest.raises(ValueError) as exc:
-            product_service.delete_product(invalid_id)
-        assert "Invalid product ID" in str(exc.value)
 
     def test_delete_product_not_found_after_check(self, product_service, mock_db):
         # Arrange
-        product_id = str(ObjectId())
-        mock_db.products.find_one.return_value = {"_id": ObjectId(product_id)}
+        product_id = _PID_STR
+        mock_db.products.find_one.return_value = {"_id": _PID}
         mock_db.inventory.find_one.return_value = None
         mock_db.products.delete_one.return_value.deleted_count = 0
 
@@ -206,10 +250,10 @@ class TestProductService:
     def test_get_all_products(self, product_service, mock_db):
         # Arrange
         mock_products = [
-            {"_id": ObjectId(), "name": "Product 1"},
-            {"_id": ObjectId(), "name": "Product 2"}
+            {"_id": _OIDS[0], "name": "Product 1"},
+            {"_id": _OIDS[1], "name": "Product 2"}
         ]
-        mock_db.products.find.return_value.skip.return_value.limit.return_value = mock_products
+        mock_db.products.find.return_value = _Cursor(mock_products)
 
         # Act
         result = product_service.get_all_products(skip=0, limit=10)
@@ -222,10 +266,10 @@ class TestProductService:
     def test_search_products(self, product_service, mock_db):
         # Arrange
         mock_products = [
-            {"_id": ObjectId(), "name": "Steel Bar", "sku": "STL001"},
-            {"_id": ObjectId(), "name": "Steel Rod", "sku": "STL002"}
+            {"_id": _OIDS[0], "name": "Steel Bar", "sku": "STL001"},
+            {"_id": _OIDS[1], "name": "Steel Rod", "sku": "STL002"}
         ]
-        mock_db.products.find.return_value = mock_products
+        mock_db.products.find.return_value = _Cursor(mock_products)
 
         # Act
         result = product_service.search_products("Steel")